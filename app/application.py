@@ -6,15 +6,21 @@ Manages the Qt application lifecycle and coordinates all components.
 from __future__ import annotations
 
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
+import numpy as np
 from PIL import Image
 
-from PySide6.QtWidgets import QApplication, QMessageBox
-from PySide6.QtCore import QObject, Signal
+from PySide6.QtWidgets import (
+    QApplication, QMessageBox, QHBoxLayout, QVBoxLayout, QPushButton,
+    QWidget, QFrame, QLabel, QSizePolicy
+)
+from PySide6.QtCore import QObject, Signal, QThreadPool, QTimer
 
 from app.ui.main_window import MainWindow
+from app.ui.thumbnails import prefetch_thumbnails
 from app.core.block_manager import BlockManager
 from app.core.exporter import Exporter
+from app.core.image_loader import ImageLoadWorker
 from app.minecraft.image_mapper import ImageToBlockMapper
 from app.minecraft.texturepack.matcher import BlockMatcher
 from app.tools.brush_tool import BrushTool
@@ -29,6 +35,12 @@ class MinepixelEditorApp(QObject):
     loading_progress = Signal(int, int)  # current, total
     loading_finished = Signal()
     
+    # Fixed row heights for the statistics dock, so rows never need measuring
+    STAT_ROW_HEIGHT = 28
+    STAT_VARIANT_HEIGHT = 22
+    # Painting refreshes the statistics at most this often (ms)
+    STATS_REFRESH_INTERVAL = 250
+    
     def __init__(self):
         super().__init__()
         
@@ -45,6 +57,21 @@ class MinepixelEditorApp(QObject):
         
         # Application state
         self.last_loaded_image: Optional[Path] = None
+        self._load_worker: Optional[ImageLoadWorker] = None
+        
+        # Pooled statistics rows, reused across statistics updates
+        self._stat_rows: List = []
+        # (canvas grid_version, block statistics) of the last analysis
+        self._stats_cache: Optional[Tuple[int, Dict]] = None
+        # Canvas grid_version the statistics dock currently shows
+        self._stats_shown_version: Optional[int] = None
+        
+        # Paint batches only mark the statistics dirty; this timer coalesces
+        # them into one refresh per interval
+        self._stats_timer = QTimer(self)
+        self._stats_timer.setSingleShot(True)
+        self._stats_timer.setInterval(self.STATS_REFRESH_INTERVAL)
+        self._stats_timer.timeout.connect(self._refresh_canvas_statistics)
     
     def setup(self):
         """Initialize Qt application and setup UI."""
@@ -63,6 +90,10 @@ class MinepixelEditorApp(QObject):
         # Show window
         self.main_window.show()
         self.main_window.set_status("Ready")
+        
+        # Warm the palette thumbnails once the window is up, so the
+        # decodes don't delay the first paint
+        QTimer.singleShot(0, self._prefetch_palette_thumbnails)
     
     def _connect_signals(self):
         """Connects signals between components."""
@@ -78,7 +109,7 @@ class MinepixelEditorApp(QObject):
         
         # Canvas signals
         canvas = self.main_window.get_canvas()
-        canvas.block_changed.connect(self._on_block_changed)
+        canvas.block_batch_changed.connect(self._on_blocks_changed)
         canvas.selection_changed.connect(self._on_selection_changed)
     
     def _setup_tools(self):
@@ -121,8 +152,8 @@ class MinepixelEditorApp(QObject):
         self.block_manager = BlockManager(texture_path)
         self.block_manager.load_blocks()
         
-        # Initialize matcher
-        self.matcher = BlockMatcher(self.block_manager.active_blocks)
+        # Share the block manager's matcher (built from the same active blocks)
+        self.matcher = self.block_manager.matcher
         
         # Populate block palette
         self.main_window.set_blocks(self.block_manager.active_blocks)
@@ -144,6 +175,13 @@ class MinepixelEditorApp(QObject):
         # Create test grid
         self._create_test_grid()
     
+    def _prefetch_palette_thumbnails(self):
+        """Decodes the palette's 24 px thumbnails in parallel."""
+        # Ignored blocks only show up in the settings dialog, which loads
+        # its rows' thumbnails on demand
+        if self.block_manager:
+            prefetch_thumbnails((b.texture_path for b in self.block_manager.active_blocks), 24)
+    
     def _create_test_grid(self):
         """Creates a test grid with active blocks."""
         if not self.block_manager or not self.block_manager.active_blocks:
@@ -151,8 +189,8 @@ class MinepixelEditorApp(QObject):
                 self.main_window.set_status("ERROR: No active blocks available")
             return
         
-        # Get solid blocks
-        solid_blocks = [b for b in self.block_manager.active_blocks if not b.has_transparency]
+        # Solid blocks are collected along with the active ones
+        solid_blocks = self.block_manager.solid_blocks
         if len(solid_blocks) < 10:
             solid_blocks = self.block_manager.active_blocks
         
@@ -160,18 +198,16 @@ class MinepixelEditorApp(QObject):
         grid_width = 64
         grid_height = 64
         
-        grid = []
-        for y in range(grid_height):
-            row = []
-            for x in range(grid_width):
-                block_index = (x + y) % len(solid_blocks)
-                row.append(solid_blocks[block_index])
-            grid.append(row)
+        # Diagonal pattern: cell (x, y) uses block (x + y) % N, gathered in one step
+        block_index = np.add.outer(np.arange(grid_height), np.arange(grid_width)) % len(solid_blocks)
+        block_array = np.empty(len(solid_blocks), dtype=object)
+        block_array[:] = solid_blocks
+        grid = block_array[block_index].tolist()
         
         if self.main_window:
+            # set_grid already fits the new grid in view
             self.main_window.set_grid(grid)
             canvas = self.main_window.get_canvas()
-            canvas.zoom_to_fit()
             
             # Set current block for painting
             if solid_blocks:
@@ -228,58 +264,75 @@ class MinepixelEditorApp(QObject):
                 self.main_window.show_error("Error", f"Error loading image: {e}")
     
     def _convert_and_load_image(self, file_path: Path, target_size=None):
-        """Converts and loads image to canvas."""
+        """Starts converting an image to blocks on a worker thread."""
         if not self.main_window or not self.matcher:
             return
         
+        if self._load_worker is not None:
+            self.main_window.set_status("An image is already being loaded")
+            return
+        
+        self.main_window.set_status(f"Converting {file_path.name} to blocks...")
+        self.main_window.show_progress(0, 100, f"Rendering {file_path.name}...")
+        
+        worker = ImageLoadWorker(
+            file_path,
+            self.matcher,
+            receiver=self.main_window,
+            on_progress=self._on_image_load_progress,
+            on_finished=self._on_image_loaded,
+            on_failed=self._on_image_load_failed,
+            target_size=target_size
+        )
+        
+        self._load_worker = worker
+        self.loading_started.emit()
+        QThreadPool.globalInstance().start(worker)
+    
+    def _on_image_load_progress(self, percent: int):
+        """Updates the progress bar from the image load worker."""
+        worker = self._load_worker
+        if self.main_window and worker:
+            self.main_window.show_progress(percent, 100, f"Rendering {worker.file_path.name}...")
+            self.loading_progress.emit(percent, 100)
+    
+    def _on_image_loaded(self, grid, width: int, height: int):
+        """Shows the grid produced by the image load worker."""
+        worker, self._load_worker = self._load_worker, None
+        self.loading_finished.emit()
+        if not self.main_window or not worker:
+            return
+        
+        file_path = worker.file_path
         try:
-            self.main_window.set_status(f"Loading image: {file_path.name}...")
-            self.main_window.show_progress(0, 100)
+            self.main_window.set_status("Finalizing...")
+            self.main_window.show_progress(100, 100, f"Finalizing {file_path.name}...")
             
-            # Load image
-            with Image.open(file_path) as img:
-                # Resize if needed
-                if target_size:
-                    img = img.resize(target_size, Image.Resampling.LANCZOS)
-                
-                # Convert to RGB
-                if img.mode != 'RGB':
-                    img = img.convert('RGB')
-                
-                width, height = img.size
-                
-                # Create mapper
-                mapper = ImageToBlockMapper(self.matcher)
-                
-                self.main_window.set_status(f"Converting {width}x{height} image to blocks...")
-                
-                # Progress callback
-                def progress_callback(progress):
-                    self.main_window.show_progress(int(progress * 100), 100, f"Rendering {file_path.name}...")
-                
-                # Convert to block grid
-                grid = mapper.map_image_to_blocks(img, progress_callback=progress_callback)
-                
-                self.main_window.set_status("Finalizing...")
-                self.main_window.show_progress(100, 100, f"Finalizing {file_path.name}...")
-                
-                # Set grid on canvas
-                self.main_window.set_grid(grid)
-                self.main_window.get_canvas().zoom_to_fit()
-                
-                # Update statistics
-                self._update_block_statistics(grid)
-                
-                self.main_window.hide_progress()
-                self.main_window.set_status(
-                    f"Loaded {file_path.name} ({width}x{height})"
-                )
+            # Set grid on canvas (which also fits it in view)
+            self.main_window.set_grid(grid)
             
+            # Update statistics
+            self._update_block_statistics(grid)
+            
+            self.main_window.hide_progress()
+            self.main_window.set_status(
+                f"Loaded {file_path.name} ({width}x{height})"
+            )
         except Exception as e:
-            self.main_window.show_error("Error", f"Error converting image: {e}")
-            self.main_window.set_status("Error converting image")
+            self._on_image_load_failed(str(e))
     
-    def _on_export_requested(self):
+    def _on_image_load_failed(self, message: str):
+        """Reports an image load worker error."""
+        self._load_worker = None
+        self.loading_finished.emit()
+        if not self.main_window:
+            return
+        
+        self.main_window.hide_progress()
+        self.main_window.show_error("Error", f"Error converting image: {message}")
+        self.main_window.set_status("Error converting image")
+    
+    def _on_export_requested(self, file_path: Path):
         """Handles export request."""
         if not self.main_window:
             return
@@ -289,27 +342,18 @@ class MinepixelEditorApp(QObject):
             self.main_window.show_warning("Warning", "No image to export. Load an image first.")
             return
         
-        from PySide6.QtWidgets import QFileDialog
-        
-        file_path, _ = QFileDialog.getSaveFileName(
-            self.main_window,
-            "Export Image",
-            "",
-            "PNG Images (*.png)"
-        )
-        
-        if file_path:
-            try:
-                path = Path(file_path)
-                if path.suffix.lower() != '.png':
-                    path = path.with_suffix('.png')
-                
-                self.main_window.set_status(f"Exporting image to {path.name}...")
-                self.exporter.export_image(canvas._grid, path)
-                self.main_window.set_status(f"Exported image to {path.name}")
-                self.main_window.show_info("Success", f"Image exported to {path.name}")
-            except Exception as e:
-                self.main_window.show_error("Error", f"Export error: {e}")
+        try:
+            path = file_path
+            if path.suffix.lower() != '.png':
+                path = path.with_suffix('.png')
+            
+            self.main_window.set_status(f"Exporting image to {path.name}...")
+            grid_ids, block_table = canvas.get_id_grid()
+            self.exporter.export_image(canvas._grid, path, grid_ids, block_table)
+            self.main_window.set_status(f"Exported image to {path.name}")
+            self.main_window.show_info("Success", f"Image exported to {path.name}")
+        except Exception as e:
+            self.main_window.show_error("Error", f"Export error: {e}")
     
     def _on_export_block_list_requested(self, file_path: Path):
         """Handles export block list request."""
@@ -322,14 +366,8 @@ class MinepixelEditorApp(QObject):
             return
         
         try:
-            from app.core.block_manager import BlockManager
-            
             # Analyze grid with variants
-            block_stats = self.exporter.analyze_grid_blocks(
-                canvas._grid,
-                BlockManager.get_base_block_name,
-                BlockManager.get_block_variant
-            )
+            block_stats = self._analyze_canvas_blocks()
             
             # Export to file
             self.exporter.export_block_list(block_stats, file_path)
@@ -351,6 +389,8 @@ class MinepixelEditorApp(QObject):
     def _on_settings_changed(self):
         """Handles settings change - update palette with new active blocks."""
         if self.main_window and self.block_manager:
+            # New images are converted with the refiltered block set
+            self.matcher = self.block_manager.matcher
             self.main_window.set_blocks(self.block_manager.active_blocks)
             self.main_window.set_status(
                 f"Settings updated - {len(self.block_manager.active_blocks)} active blocks"
@@ -366,42 +406,39 @@ class MinepixelEditorApp(QObject):
             return
         
         try:
-            # Get current grid dimensions
-            height = len(canvas._grid)
-            width = len(canvas._grid[0]) if height > 0 else 0
-            
-            if width == 0 or height == 0:
+            grid_ids, block_table = canvas.get_id_grid()
+            if grid_ids is None or grid_ids.size == 0:
                 return
             
-            # Convert grid back to image, then re-convert with new blocks
-            # Create a temporary image from current colors
-            from PIL import Image
-            import numpy as np
-            
-            # Extract colors from current grid
-            img_array = np.zeros((height, width, 3), dtype=np.uint8)
-            for y in range(height):
-                for x in range(width):
-                    block = canvas._grid[y][x]
-                    if block and block.avg_color:
-                        img_array[y, x] = block.avg_color[:3]
-            
-            img = Image.fromarray(img_array, 'RGB')
+            # Convert grid back to colors, then re-convert with new blocks:
+            # one uint8 color per distinct block, gathered through the id grid
+            palette = np.zeros((len(block_table), 3), dtype=np.uint8)
+            for index, block in enumerate(block_table):
+                if block.avg_color:
+                    palette[index] = block.avg_color[:3]
+            img_array = palette[grid_ids]
             
             # Show progress
             self.main_window.show_progress(0, 100, "Re-rendering with new blocks...")
             
             # Re-map with new blocks
-            from app.minecraft.image_mapper import ImageToBlockMapper
             mapper = ImageToBlockMapper(self.block_manager.matcher)
             
+            # Only repaint and pump events when the shown percentage changes,
+            # not on every matched tile
+            last_percent = -1
+            
             def progress_callback(progress: float):
+                nonlocal last_percent
                 progress_percent = int(progress * 100)
+                if progress_percent == last_percent:
+                    return
+                last_percent = progress_percent
                 self.main_window.show_progress(progress_percent, 100, "Re-rendering...")
-                from PySide6.QtWidgets import QApplication
                 QApplication.processEvents()
             
-            new_grid = mapper.map_image_to_blocks(img, progress_callback=progress_callback)
+            # The array is mapped directly, without a round-trip through a PIL image
+            new_grid = mapper.map_image_to_blocks(img_array, progress_callback=progress_callback)
             
             # Update canvas
             self.main_window.show_progress(100, 100, "Finalizing...")
@@ -424,16 +461,21 @@ class MinepixelEditorApp(QObject):
             self.brush_tool.set_brush_size(size)
             self.main_window.set_status(f"Brush size: {size}x{size}")
     
-    def _on_block_changed(self, x: int, y: int, block):
-        """Called when a block is changed (painted)."""
-        if not self.main_window:
+    def _on_blocks_changed(self, changes: list):
+        """Called once per batch of changed (painted) blocks."""
+        if not self.main_window or not changes:
             return
         
         canvas = self.main_window.get_canvas()
         info = canvas.get_canvas_info()
         
+        if not self._stats_timer.isActive():
+            self._stats_timer.start()
+        
+        x, y, block = changes[-1]
+        changed = f"{len(changes)} blocks changed, last" if len(changes) > 1 else "Block changed"
         self.main_window.set_status(
-            f"Block changed at ({x}, {y}) -> {block.block_id} | "
+            f"{changed} at ({x}, {y}) -> {block.block_id} | "
             f"Zoom: {info['zoom_level']:.1f}x | Grid: {info['grid_width']}x{info['grid_height']}"
         )
     
@@ -469,25 +511,34 @@ class MinepixelEditorApp(QObject):
         if not self.main_window or not grid:
             return
         
-        from PySide6.QtWidgets import QHBoxLayout, QVBoxLayout, QPushButton, QWidget, QFrame, QLabel
-        from PySide6.QtGui import QPixmap
-        from PySide6.QtCore import Qt
-        from app.core.block_manager import BlockManager
+        # The statistics dock is built lazily; make sure it exists
+        self.main_window.ensure_stats_dock()
         
-        # Clear previous widgets
-        while self.main_window.stats_layout.count():
-            item = self.main_window.stats_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
+        # The dock only needs rebuilding when the canvas grid has changed
+        # since it was last filled; a refresh also covers paint batches still
+        # waiting on the coalescing timer
+        canvas = self.main_window.get_canvas()
+        if grid is canvas._grid:
+            self._stats_timer.stop()
+            if self._stats_shown_version == canvas.grid_version:
+                return
+            self._stats_shown_version = canvas.grid_version
+        else:
+            self._stats_shown_version = None
         
         # Analyze grid with variants
-        block_stats = self.exporter.analyze_grid_blocks(
-            grid,
-            BlockManager.get_base_block_name,
-            BlockManager.get_block_variant
-        )
+        if grid is canvas._grid:
+            block_stats = self._analyze_canvas_blocks()
+        else:
+            block_stats = self.exporter.analyze_grid_blocks(
+                grid,
+                BlockManager.get_base_block_name,
+                BlockManager.get_block_variant
+            )
         
         if not block_stats:
+            for row in self._stat_rows:
+                row.setVisible(False)
             self.main_window.totals_label.setText("No blocks in grid")
             return
         
@@ -501,101 +552,196 @@ class MinepixelEditorApp(QObject):
             f"<b>Unique Types:</b> {unique_types}"
         )
         
-        # Sort by count
-        sorted_blocks = sorted(block_stats.items(), key=lambda x: x[1]['total'], reverse=True)
+        # analyze_grid_blocks returns the stats already sorted by count
+        sorted_blocks = list(block_stats.items())
         
-        # Add all blocks with images and dropdowns
-        for base_name, stats in sorted_blocks:
-            display_block = stats['blocks'].get('normal') or next(iter(stats['blocks'].values()))
-            has_variants = len(stats['variants']) > 1
-            
-            # Create block entry
-            block_frame = QFrame()
-            block_frame.setFrameShape(QFrame.Shape.StyledPanel)
-            block_layout = QVBoxLayout(block_frame)
-            block_layout.setContentsMargins(5, 5, 5, 5)
-            block_layout.setSpacing(3)
-            
-            # Header with image and name
-            header_widget = QWidget()
-            header_layout = QHBoxLayout(header_widget)
-            header_layout.setContentsMargins(0, 0, 0, 0)
-            header_layout.setSpacing(8)
-            
-            # Add texture image
-            if display_block and display_block.texture_path.exists():
-                try:
-                    texture_label = QLabel()
-                    pixmap = QPixmap(str(display_block.texture_path))
-                    if not pixmap.isNull():
-                        scaled_pixmap = pixmap.scaled(24, 24, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.FastTransformation)
-                        texture_label.setPixmap(scaled_pixmap)
-                        header_layout.addWidget(texture_label)
-                except Exception:
-                    pass
+        # Decode the row and variant textures that aren't cached yet in parallel
+        prefetch_thumbnails((self._stat_display_block(stats).texture_path for _, stats in sorted_blocks), 24)
+        prefetch_thumbnails(
+            (block.texture_path for _, stats in sorted_blocks if len(stats['variants']) > 1
+             for block in stats['blocks'].values()),
+            20
+        )
+        
+        # Reuse pooled rows and relayout once, instead of rebuilding every widget
+        stats_widget = self.main_window.stats_widget
+        stats_widget.setUpdatesEnabled(False)
+        try:
+            for index, (base_name, stats) in enumerate(sorted_blocks):
+                if index < len(self._stat_rows):
+                    row = self._stat_rows[index]
+                else:
+                    row = self._create_stat_row()
+                    self._stat_rows.append(row)
+                    # Insert before the trailing stretch
+                    self.main_window.stats_layout.insertWidget(index, row)
+                self._fill_stat_row(row, base_name, stats)
+                row.setVisible(True)
             
-            # Add name and count
-            # Remove 'minecraft:' prefix for cleaner display
-            display_name = base_name.replace('minecraft:', '')
-            name_label = QLabel(f"<b>{display_name}:</b> {stats['total']} blocks")
-            header_layout.addWidget(name_label, stretch=1)
-            block_layout.addWidget(header_widget)
+            # Hide the unused tail of the pool
+            for row in self._stat_rows[len(sorted_blocks):]:
+                row.setVisible(False)
+        finally:
+            stats_widget.setUpdatesEnabled(True)
+            # One geometry pass for the whole refill
+            stats_widget.updateGeometry()
+            stats_widget.update()
+    
+    def _refresh_canvas_statistics(self):
+        """Refreshes the statistics dock from the (painted) canvas grid."""
+        if self.main_window:
+            self._update_block_statistics(self.main_window.get_canvas()._grid)
+    
+    def _analyze_canvas_blocks(self) -> Dict:
+        """Block statistics of the canvas grid, reused until the grid is edited."""
+        canvas = self.main_window.get_canvas()
+        if self._stats_cache is not None and self._stats_cache[0] == canvas.grid_version:
+            return self._stats_cache[1]
+        
+        # The canvas keeps per-block counts for its grid, so no cell scan is needed
+        block_stats = self.exporter.analyze_grid_blocks(
+            canvas._grid,
+            BlockManager.get_base_block_name,
+            BlockManager.get_block_variant,
+            block_counts=canvas.get_block_counts()
+        )
+        self._stats_cache = (canvas.grid_version, block_stats)
+        return block_stats
+    
+    def _create_stat_row(self):
+        """Creates an empty statistics row for the pool."""
+        # Create block entry
+        block_frame = QFrame()
+        block_frame.setFrameShape(QFrame.Shape.StyledPanel)
+        # Rows only grow when their variants are expanded
+        block_frame.setSizePolicy(QSizePolicy.Policy.Preferred, QSizePolicy.Policy.Fixed)
+        block_layout = QVBoxLayout(block_frame)
+        block_layout.setContentsMargins(5, 5, 5, 5)
+        block_layout.setSpacing(3)
+        
+        # Header with image and name
+        header_widget = QWidget()
+        header_layout = QHBoxLayout(header_widget)
+        header_layout.setContentsMargins(0, 0, 0, 0)
+        header_layout.setSpacing(8)
+        header_widget.setFixedHeight(self.STAT_ROW_HEIGHT)
+        
+        texture_label = QLabel()
+        header_layout.addWidget(texture_label)
+        name_label = QLabel()
+        header_layout.addWidget(name_label, stretch=1)
+        block_layout.addWidget(header_widget)
+        
+        # Collapsible variants section
+        variants_btn = QPushButton()
+        variants_btn.setFlat(True)
+        variants_btn.setStyleSheet("text-align: left; padding: 2px;")
+        
+        variants_widget = QWidget()
+        variants_layout = QVBoxLayout(variants_widget)
+        variants_layout.setContentsMargins(20, 0, 0, 0)
+        variants_layout.setSpacing(2)
+        variants_widget.setVisible(False)
+        
+        # Toggle function
+        def toggle():
+            visible = not variants_widget.isVisible()
+            variants_widget.setVisible(visible)
+            variants_btn.setText(("▼" if visible else "▶") + variants_btn.text()[1:])
+        
+        variants_btn.clicked.connect(toggle)
+        block_layout.addWidget(variants_btn)
+        block_layout.addWidget(variants_widget)
+        
+        block_frame.texture_label = texture_label
+        block_frame.name_label = name_label
+        block_frame.variants_btn = variants_btn
+        block_frame.variants_widget = variants_widget
+        block_frame.variants_layout = variants_layout
+        # What the row currently shows, so unchanged rows can be skipped
+        block_frame.signature = None
+        # Tracked here rather than asked of Qt on every fill (the button
+        # starts out visible)
+        block_frame.variants_shown = True
+        return block_frame
+    
+    def _fill_stat_row(self, row, base_name: str, stats: dict):
+        """Writes one block's statistics into a pooled row."""
+        # Rows already showing these exact counts are left untouched
+        signature = (base_name, stats['total'], frozenset(stats['variants'].items()))
+        if row.signature == signature:
+            return
+        row.signature = signature
+        
+        display_block = self._stat_display_block(stats)
+        has_variants = len(stats['variants']) > 1
+        
+        # Texture image
+        self._set_stat_texture(row.texture_label, display_block, 24)
+        
+        # Remove 'minecraft:' prefix for cleaner display
+        display_name = base_name.replace('minecraft:', '')
+        row.name_label.setText(f"<b>{display_name}:</b> {stats['total']} blocks")
+        
+        # Fast path for single-variant rows (most of them): only the header
+        # changes, and the variant section is torn down only if it was in use
+        if not has_variants:
+            if row.variants_shown:
+                self._clear_stat_variants(row)
+                row.variants_btn.setVisible(False)
+                row.variants_shown = False
+            return
+        
+        # Variant rows are rebuilt; the pooled row itself is kept
+        self._clear_stat_variants(row)
+        variants_layout = row.variants_layout
+        row.variants_btn.setVisible(True)
+        row.variants_shown = True
+        row.variants_btn.setText(f"▶ {len(stats['variants'])} variants")
+        
+        # Add each variant (analyze_grid_blocks already ordered them by count)
+        for variant, count in stats['variants'].items():
+            variant_block = stats['blocks'].get(variant)
+            variant_widget = QWidget()
+            variant_layout = QHBoxLayout(variant_widget)
+            variant_layout.setContentsMargins(0, 0, 0, 0)
+            variant_layout.setSpacing(8)
+            variant_widget.setFixedHeight(self.STAT_VARIANT_HEIGHT)
             
-            # Add variants dropdown if multiple
-            if has_variants:
-                # Create collapsible section
-                variants_btn = QPushButton(f"▶ {len(stats['variants'])} variants")
-                variants_btn.setFlat(True)
-                variants_btn.setStyleSheet("text-align: left; padding: 2px;")
-                
-                # Variants container
-                variants_widget = QWidget()
-                variants_layout = QVBoxLayout(variants_widget)
-                variants_layout.setContentsMargins(20, 0, 0, 0)
-                variants_layout.setSpacing(2)
-                variants_widget.setVisible(False)
-                
-                # Add each variant
-                for variant, count in sorted(stats['variants'].items(), key=lambda x: x[1], reverse=True):
-                    variant_block = stats['blocks'].get(variant)
-                    variant_widget = QWidget()
-                    variant_layout = QHBoxLayout(variant_widget)
-                    variant_layout.setContentsMargins(0, 0, 0, 0)
-                    variant_layout.setSpacing(8)
-                    
-                    # Variant texture
-                    if variant_block and variant_block.texture_path.exists():
-                        try:
-                            var_texture_label = QLabel()
-                            var_pixmap = QPixmap(str(variant_block.texture_path))
-                            if not var_pixmap.isNull():
-                                var_scaled = var_pixmap.scaled(20, 20, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.FastTransformation)
-                                var_texture_label.setPixmap(var_scaled)
-                                variant_layout.addWidget(var_texture_label)
-                        except Exception:
-                            pass
-                    
-                    var_label = QLabel(f"{variant.capitalize()}: {count}")
-                    variant_layout.addWidget(var_label, stretch=1)
-                    variants_layout.addWidget(variant_widget)
-                
-                # Toggle function
-                def make_toggle(btn, widget):
-                    def toggle():
-                        visible = not widget.isVisible()
-                        widget.setVisible(visible)
-                        btn.setText(("▼" if visible else "▶") + btn.text()[1:])
-                    return toggle
-                
-                variants_btn.clicked.connect(make_toggle(variants_btn, variants_widget))
-                block_layout.addWidget(variants_btn)
-                block_layout.addWidget(variants_widget)
+            # Variant texture
+            var_texture_label = QLabel()
+            if self._set_stat_texture(var_texture_label, variant_block, 20):
+                variant_layout.addWidget(var_texture_label)
             
-            self.main_window.stats_layout.addWidget(block_frame)
-        
-        # Add stretch at the end
-        self.main_window.stats_layout.addStretch()
-
+            var_label = QLabel(f"{variant.capitalize()}: {count}")
+            variant_layout.addWidget(var_label, stretch=1)
+            variants_layout.addWidget(variant_widget)
+    
+    @staticmethod
+    def _clear_stat_variants(row):
+        """Removes a pooled row's variant sub-rows and collapses the section."""
+        variants_layout = row.variants_layout
+        while variants_layout.count():
+            item = variants_layout.takeAt(0)
+            if item.widget():
+                item.widget().deleteLater()
+        row.variants_widget.setVisible(False)
+    
+    @staticmethod
+    def _stat_display_block(stats: dict):
+        """The block whose texture represents a statistics row."""
+        return stats['blocks'].get('normal') or next(iter(stats['blocks'].values()))
+    
+    def _set_stat_texture(self, label, block, size: int) -> bool:
+        """Shows a block texture on a statistics label; returns whether one was set."""
+        pixmap = self.main_window.get_thumbnail(block.texture_path, size) if block else None
+        if pixmap is not None:
+            label.setPixmap(pixmap)
+            label.setVisible(True)
+            return True
+        label.clear()
+        label.setVisible(False)
+        return False
     
     def run(self):
         """Run the application main loop."""
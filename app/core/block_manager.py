@@ -5,10 +5,16 @@ Handles loading, filtering, and managing Minecraft block textures.
 
 from __future__ import annotations
 
+import hashlib
+import re
 from pathlib import Path
-from typing import List, Set
+from typing import List, Set, FrozenSet, Optional, Tuple
 from collections import defaultdict
+from functools import lru_cache
 
+import numpy as np
+
+import config
 from app.minecraft.texturepack.parser import TexturePackParser
 from app.minecraft.texturepack.analyzer import TextureAnalyzer
 from app.minecraft.texturepack.matcher import BlockMatcher
@@ -22,6 +28,14 @@ class BlockManager:
     """
     
     DIRECTIONAL_SUFFIXES = ['_top', '_side', '_front', '_back', '_bottom', '_end']
+    # All suffixes as one anchored alternation (a single C-level match per id)
+    _SUFFIX_RE = re.compile('(?:' + '|'.join(map(re.escape, DIRECTIONAL_SUFFIXES)) + r')\Z')
+    
+    # Texture analysis results are cached here, keyed by the texture pack contents
+    ANALYSIS_CACHE_DIR = config.DATA_DIR / "cache"
+    # Bump when the analyzer or the cache file layout changes
+    ANALYSIS_CACHE_VERSION = 2
+    TRANSPARENCY_THRESHOLD = 0.05
     
     def __init__(self, texture_path: Path):
         """
@@ -33,10 +47,16 @@ class BlockManager:
         self.texture_path = texture_path
         self.all_blocks: List[BlockTexture] = []
         self.active_blocks: List[BlockTexture] = []
+        # Active blocks without transparency (kept in step by _apply_filters)
+        self.solid_blocks: List[BlockTexture] = []
         self.default_ignored_blocks: Set[str] = load_ignored_textures()
-        self.user_ignored_blocks: Set[str] = set()
+        # Replaced wholesale (never mutated) so readers can hold a snapshot
+        self.user_ignored_blocks: FrozenSet[str] = frozenset()
+        self.transparent_base_names: FrozenSet[str] = frozenset()
         self.matcher: BlockMatcher = None
         self._grouped_blocks_cache = None
+        self._sorted_base_names: List[str] = []
+        self._base_name_index: Optional[Tuple[List[str], List[str]]] = None
         self._settings_initialized = False
     
     def load_blocks(self) -> None:
@@ -46,6 +66,8 @@ class BlockManager:
         # Parse all blocks (no filtering)
         parser = TexturePackParser(self.texture_path)
         self.all_blocks = parser.parse(ignore_non_blocks=False)
+        self._grouped_blocks_cache = None
+        self._base_name_index = None
         
         # Filter log_top textures
         original_count = len(self.all_blocks)
@@ -55,10 +77,16 @@ class BlockManager:
             print(f"[DEBUG] Filtered {log_top_filtered} log_top textures")
         
         # Analyze textures for transparency
-        print("[DEBUG] Analyzing textures for transparency...")
-        analyzer = TextureAnalyzer(transparency_threshold=0.05)
-        analyzer.analyze(self.all_blocks)
-        transparent_count = sum(1 for b in self.all_blocks if b.has_transparency)
+        self._analyze_blocks(self.all_blocks)
+        
+        # One pass over the analyzed blocks for the transparency summary
+        transparent_count = 0
+        transparent_base_names = set()
+        for b in self.all_blocks:
+            if b.has_transparency:
+                transparent_count += 1
+                transparent_base_names.add(self.get_base_block_name(b.block_id))
+        self.transparent_base_names = frozenset(transparent_base_names)
         print(f"[DEBUG] Found {transparent_count} blocks with transparency out of {len(self.all_blocks)}")
         
         # Initialize user ignored blocks
@@ -77,59 +105,116 @@ class BlockManager:
         if self.active_blocks:
             self.matcher = BlockMatcher(self.active_blocks, allow_transparency=False)
     
+    def _analyze_blocks(self, blocks: List[BlockTexture]) -> None:
+        """Analyzes textures, reusing the cached results if the pack is unchanged."""
+        cache_path = self._analysis_cache_path(blocks)
+        if cache_path is not None and self._load_analysis_cache(cache_path, blocks):
+            print(f"[DEBUG] Loaded texture analysis from {cache_path}")
+            return
+        
+        print("[DEBUG] Analyzing textures for transparency...")
+        analyzer = TextureAnalyzer(transparency_threshold=self.TRANSPARENCY_THRESHOLD)
+        analyzer.analyze(blocks)
+        
+        if cache_path is not None:
+            self._save_analysis_cache(cache_path, blocks)
+    
+    def _analysis_cache_path(self, blocks: List[BlockTexture]) -> Optional[Path]:
+        """Returns the cache file for this exact set of textures (names, mtimes and sizes)."""
+        seed = f"v{self.ANALYSIS_CACHE_VERSION}|{self.TRANSPARENCY_THRESHOLD}"
+        digest = hashlib.blake2b(seed.encode(), digest_size=8)
+        try:
+            for block in sorted(blocks, key=lambda b: b.texture_path.name):
+                stat = block.texture_path.stat()
+                digest.update(f"{block.texture_path.name}|{stat.st_mtime_ns}|{stat.st_size}\n".encode())
+        except OSError:
+            return None
+        return self.ANALYSIS_CACHE_DIR / f"texpack_{digest.hexdigest()}.npz"
+    
+    def _load_analysis_cache(self, cache_path: Path, blocks: List[BlockTexture]) -> bool:
+        """Applies cached analysis results to blocks; returns False if unusable."""
+        if not cache_path.exists():
+            return False
+        
+        try:
+            with np.load(cache_path, allow_pickle=False) as data:
+                names = data['names'].tolist()
+                transparent = data['trans'].tolist()
+                rgb = data['rgb'].tolist()
+                lab = data['lab'].tolist()
+        except Exception as e:
+            print(f"[WARNING] Ignoring unreadable analysis cache {cache_path}: {e}")
+            return False
+        
+        index = {name: i for i, name in enumerate(names)}
+        if any(block.texture_path.name not in index for block in blocks):
+            return False
+        
+        for block in blocks:
+            i = index[block.texture_path.name]
+            block.has_transparency = transparent[i]
+            if transparent[i]:
+                block.avg_color = None
+                block.lab_color = None
+            else:
+                block.avg_color = tuple(int(c) for c in rgb[i])
+                block.lab_color = tuple(lab[i])
+        return True
+    
+    def _save_analysis_cache(self, cache_path: Path, blocks: List[BlockTexture]) -> None:
+        """Writes analysis results next to the other app data."""
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            np.savez(
+                cache_path,
+                names=np.array([b.texture_path.name for b in blocks]),
+                trans=np.array([b.has_transparency for b in blocks], dtype=bool),
+                # Average colors are 0-255 ints and LAB is float64, so both
+                # round-trip exactly and a warm start matches a fresh analysis
+                rgb=np.array([b.avg_color or (0, 0, 0) for b in blocks], dtype=np.uint8),
+                lab=np.array([b.lab_color or (0.0, 0.0, 0.0) for b in blocks], dtype=np.float64),
+            )
+        except OSError as e:
+            print(f"[WARNING] Could not write analysis cache {cache_path}: {e}")
+    
     def _initialize_user_ignored_blocks(self) -> None:
         """Initialize user_ignored_blocks with default ignored textures and transparent blocks."""
         if not self.all_blocks:
             print("[WARNING] Cannot initialize ignored blocks - no blocks loaded yet")
             return
         
-        # Group blocks to get base names and their variants
-        all_base_names = set()
-        base_to_variants = defaultdict(set)
-        base_to_blocks = defaultdict(list)
+        # One pass over the blocks: a base name is listed if its own name or
+        # any variant's texture is in ignored_textures.txt, otherwise it is
+        # ignored if any variant has transparency
+        default_ignored = self.default_ignored_blocks
+        base_names = set()
+        listed = set()
+        transparent = set()
         
         for block in self.all_blocks:
             base_name = self.get_base_block_name(block.block_id)
-            all_base_names.add(base_name)
-            texture_name = block.block_id.split(':')[-1] if ':' in block.block_id else block.block_id
-            base_to_variants[base_name].add(texture_name)
-            base_to_blocks[base_name].append(block)
-        
-        print(f"[DEBUG] Found {len(all_base_names)} unique base names in loaded blocks")
-        print(f"[DEBUG] Default ignored list has {len(self.default_ignored_blocks)} entries")
-        
-        matched_count = 0
-        transparency_count = 0
-        
-        for base_name in all_base_names:
-            name_without_prefix = base_name.split(':')[-1] if ':' in base_name else base_name
-            
-            # Check if base name itself is in ignored list
-            if name_without_prefix in self.default_ignored_blocks:
-                self.user_ignored_blocks.add(base_name)
-                matched_count += 1
-                continue
-            
-            # Check if ANY of the variants are in ignored list
-            variants = base_to_variants[base_name]
-            variant_matched = False
-            for variant in variants:
-                if variant in self.default_ignored_blocks:
-                    self.user_ignored_blocks.add(base_name)
-                    matched_count += 1
-                    variant_matched = True
-                    break
-            
-            if variant_matched:
+            base_names.add(base_name)
+            if base_name in listed:
                 continue
-            
-            # Check if ANY variant has transparency
-            blocks_for_base = base_to_blocks[base_name]
-            for block in blocks_for_base:
-                if block.has_transparency:
-                    self.user_ignored_blocks.add(base_name)
-                    transparency_count += 1
-                    break
+            if (self.strip_namespace(base_name) in default_ignored
+                    or self.strip_namespace(block.block_id) in default_ignored):
+                listed.add(base_name)
+            elif block.has_transparency:
+                transparent.add(base_name)
+        
+        # A later variant may have moved a base name onto the list
+        transparent -= listed
+        
+        print(f"[DEBUG] Found {len(base_names)} unique base names in loaded blocks")
+        print(f"[DEBUG] Default ignored list has {len(default_ignored)} entries")
+        
+        ignored = set(self.user_ignored_blocks)
+        ignored |= listed
+        ignored |= transparent
+        matched_count = len(listed)
+        transparency_count = len(transparent)
+        
+        self.user_ignored_blocks = frozenset(ignored)
         
         print(f"[INFO] Initialized with {len(self.user_ignored_blocks)} default ignored blocks:")
         print(f"       - {matched_count} matched from ignored_textures.txt")
@@ -137,11 +222,15 @@ class BlockManager:
     
     def _apply_filters(self) -> None:
         """Applies current filters to create active_blocks list."""
+        ignored = self.user_ignored_blocks
         self.active_blocks = []
+        self.solid_blocks = []
         for block in self.all_blocks:
             base_name = self.get_base_block_name(block.block_id)
-            if base_name not in self.user_ignored_blocks:
+            if base_name not in ignored:
                 self.active_blocks.append(block)
+                if not block.has_transparency:
+                    self.solid_blocks.append(block)
     
     def is_block_ignored(self, base_name: str) -> bool:
         """Check if a block is ignored."""
@@ -150,37 +239,60 @@ class BlockManager:
     def toggle_block_ignore(self, base_name: str, is_ignored: bool) -> None:
         """Toggle ignore state for a block."""
         if is_ignored:
-            self.user_ignored_blocks.add(base_name)
+            self.user_ignored_blocks = self.user_ignored_blocks | {base_name}
         else:
-            self.user_ignored_blocks.discard(base_name)
+            self.user_ignored_blocks = self.user_ignored_blocks - {base_name}
     
     def reset_to_defaults(self) -> None:
         """Resets ignored blocks to default state."""
-        self.user_ignored_blocks.clear()
+        self.user_ignored_blocks = frozenset()
         self._initialize_user_ignored_blocks()
         self._apply_filters()
     
     def reload_with_filters(self) -> None:
-        """Reloads blocks with current filter settings."""
+        """
+        Reapplies the current filters to the already loaded blocks.
+        
+        The texture pack is not parsed or analyzed again, and the matcher is
+        only rebuilt if the active block set actually changed.
+        """
+        previous_active = self.active_blocks
         self._apply_filters()
+        if self.matcher is not None and self.active_blocks == previous_active:
+            return
         if self.active_blocks:
             self.matcher = BlockMatcher(self.active_blocks, allow_transparency=False)
     
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def split_block_id(block_id: str) -> Tuple[str, str]:
+        """
+        Splits a block id into (base name, variant) with one suffix match.
+        
+        Block ids come from a finite texture pack, so results are memoized and
+        later calls are a single dict lookup.
+        """
+        match = BlockManager._SUFFIX_RE.search(block_id)
+        if match:
+            # Remove leading underscore
+            return block_id[:match.start()], block_id[match.start() + 1:]
+        return block_id, 'normal'
+    
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def strip_namespace(block_id: str) -> str:
+        """Returns a block id without its 'namespace:' prefix (memoized)."""
+        return block_id.rpartition(':')[2]
+    
     @staticmethod
     def get_base_block_name(block_id: str) -> str:
         """Gets the base name of a block by removing directional suffixes."""
-        for suffix in BlockManager.DIRECTIONAL_SUFFIXES:
-            if block_id.endswith(suffix):
-                return block_id[:-len(suffix)]
-        return block_id
+        return BlockManager.split_block_id(block_id)[0]
     
     @staticmethod
     def get_block_variant(block_id: str) -> str:
         """Gets the variant type of a block."""
-        for suffix in BlockManager.DIRECTIONAL_SUFFIXES:
-            if block_id.endswith(suffix):
-                return suffix[1:]  # Remove leading underscore
-        return 'normal'
+        return BlockManager.split_block_id(block_id)[1]
     
     def get_grouped_blocks(self) -> dict:
         """Returns grouped blocks by base name (cached)."""
@@ -188,10 +300,33 @@ class BlockManager:
             print("[DEBUG] Building grouped blocks cache...")
             self._grouped_blocks_cache = defaultdict(lambda: {'variants': [], 'blocks': {}})
             for block in self.all_blocks:
-                base_name = self.get_base_block_name(block.block_id)
-                variant = self.get_block_variant(block.block_id)
+                base_name, variant = self.split_block_id(block.block_id)
                 self._grouped_blocks_cache[base_name]['variants'].append(variant)
                 self._grouped_blocks_cache[base_name]['blocks'][variant] = block
+            self._sorted_base_names = sorted(self._grouped_blocks_cache)
             print(f"[DEBUG] Cache built with {len(self._grouped_blocks_cache)} base blocks")
         
         return self._grouped_blocks_cache
+    
+    def get_sorted_base_names(self) -> List[str]:
+        """Returns all base names in sorted order (cached with the grouping)."""
+        self.get_grouped_blocks()
+        return self._sorted_base_names
+    
+    def get_base_name_index(self) -> Tuple[List[str], List[str]]:
+        """
+        Returns every lowercase suffix of every base name, sorted, with the
+        base name each came from (parallel lists, built once per load).
+        
+        Base names containing a text are the owners of the bisect range of
+        suffixes starting with it.
+        """
+        if self._base_name_index is None:
+            entries = sorted(
+                (name[i:], base_name)
+                for base_name in self.get_sorted_base_names()
+                for name in (base_name.lower(),)
+                for i in range(len(name))
+            )
+            self._base_name_index = ([key for key, _ in entries], [owner for _, owner in entries])
+        return self._base_name_index
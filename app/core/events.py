@@ -0,0 +1,27 @@
+"""
+Events Module
+Custom Qt events used to hand work from worker threads back to the GUI thread.
+"""
+
+from __future__ import annotations
+
+from typing import Callable
+
+from PySide6.QtCore import QCoreApplication, QEvent, QObject
+
+
+# Registered once per process; cheaper to dispatch than a queued cross-thread signal
+REENTER_EVENT = QEvent.Type(QEvent.registerEventType())
+
+
+class ReenterEvent(QEvent):
+    """Event carrying a callable to run on the receiver's thread."""
+
+    def __init__(self, fn: Callable[[], None]):
+        super().__init__(REENTER_EVENT)
+        self.fn = fn
+
+
+def post_to(receiver: QObject, fn: Callable[[], None]) -> None:
+    """Queues fn to run in the event loop of receiver's thread (thread-safe)."""
+    QCoreApplication.postEvent(receiver, ReenterEvent(fn))
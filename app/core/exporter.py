@@ -6,9 +6,10 @@ Handles exporting canvas data to various formats (PNG, TXT, etc.).
 from __future__ import annotations
 
 from pathlib import Path
-from typing import List, Dict
-from collections import defaultdict
+from typing import List, Dict, Optional, Tuple
+from collections import Counter
 
+import numpy as np
 from PIL import Image
 
 from app.core.renderer import BlockRenderer
@@ -19,19 +20,28 @@ class Exporter:
     """Handles exporting canvas data to various formats."""
     
     @staticmethod
-    def export_image(block_grid: List[List[BlockTexture]], output_path: Path) -> None:
+    def export_image(block_grid: List[List[BlockTexture]], output_path: Path,
+                     grid_ids: Optional[np.ndarray] = None,
+                     block_table: Optional[List[BlockTexture]] = None) -> None:
         """
         Exports block grid as PNG image.
         
         Args:
             block_grid: 2D grid of BlockTexture
             output_path: Path to save PNG file
+            grid_ids: Optional (height, width) id array of the same grid into
+                      block_table (e.g. CanvasWidget.get_id_grid); renders
+                      without walking block_grid
+            block_table: Blocks referenced by grid_ids
         """
         if not block_grid or not block_grid[0]:
             raise ValueError("Empty block grid")
         
         renderer = BlockRenderer(block_size=16)
-        renderer.render(block_grid, output_path=output_path)
+        if grid_ids is not None and block_table is not None:
+            renderer.render_ids(grid_ids, block_table, output_path=output_path)
+        else:
+            renderer.render(block_grid, output_path=output_path)
     
     @staticmethod
     def export_block_list(block_stats: Dict, output_path: Path) -> None:
@@ -63,7 +73,8 @@ class Exporter:
         lines.append("="*60)
         lines.append("")
         
-        # Sort blocks by count (descending)
+        # Sort blocks by count (descending); stats from analyze_grid_blocks
+        # are already in this order, which the sort passes through in one scan
         sorted_blocks = sorted(block_stats.items(), key=lambda x: x[1]['total'], reverse=True)
         
         for base_name, stats in sorted_blocks:
@@ -88,7 +99,8 @@ class Exporter:
     @staticmethod
     def analyze_grid_blocks(block_grid: List[List[BlockTexture]], 
                            get_base_block_name_func, 
-                           get_block_variant_func) -> Dict:
+                           get_block_variant_func,
+                           block_counts: Optional[List[Tuple[BlockTexture, int]]] = None) -> Dict:
         """
         Analyzes block grid and returns statistics.
         
@@ -96,31 +108,52 @@ class Exporter:
             block_grid: 2D grid of BlockTexture
             get_base_block_name_func: Function to get base name from block_id
             get_block_variant_func: Function to get variant from block_id
+            block_counts: Optional precomputed (block, count) pairs for the grid
+                          (e.g. CanvasWidget.get_block_counts); skips the cell scan
         
         Returns:
-            Dictionary with block statistics
+            Dictionary with block statistics, ordered by total count (most first);
+            each block's 'variants' are ordered by count as well
         """
         if not block_grid:
             return {}
         
-        # Count blocks by base name and variant
-        block_counts = defaultdict(lambda: {
-            'total': 0,
-            'variants': defaultdict(int),
-            'blocks': {}  # variant -> BlockTexture
-        })
-        
-        for row in block_grid:
-            for block in row:
-                if block:
-                    base_name = get_base_block_name_func(block.block_id)
-                    variant = get_block_variant_func(block.block_id)
-                    
-                    block_counts[base_name]['total'] += 1
-                    block_counts[base_name]['variants'][variant] += 1
-                    
-                    # Store one example of each variant
-                    if variant not in block_counts[base_name]['blocks']:
-                        block_counts[base_name]['blocks'][variant] = block
-        
-        return dict(block_counts)
+        # Count blocks by base name and variant (plain dicts; an entry is
+        # created the first time its base name is seen)
+        stats_by_base = {}
+        
+        # Count cells per block id in one pass, then resolve base name and
+        # variant once per distinct id rather than once per cell
+        if block_counts is not None:
+            id_counts = {block.block_id: count for block, count in block_counts}
+            examples = {block.block_id: block for block, _ in block_counts}
+        else:
+            id_counts = Counter(block.block_id for row in block_grid for block in row if block)
+            examples = {block.block_id: block for row in block_grid for block in row if block}
+        
+        for block_id, count in id_counts.items():
+            base_name = get_base_block_name_func(block_id)
+            variant = get_block_variant_func(block_id)
+            
+            entry = stats_by_base.get(base_name)
+            if entry is None:
+                entry = stats_by_base[base_name] = {
+                    'total': 0,
+                    'variants': {},
+                    'blocks': {}  # variant -> BlockTexture
+                }
+            entry['total'] += count
+            variants = entry['variants']
+            variants[variant] = variants.get(variant, 0) + count
+            
+            # Store one example of each variant
+            entry['blocks'].setdefault(variant, examples[block_id])
+        
+        # Each block's variants are ordered by count (most first) here, once,
+        # so the statistics view can list them as stored
+        for entry in stats_by_base.values():
+            if len(entry['variants']) > 1:
+                entry['variants'] = dict(sorted(entry['variants'].items(), key=lambda x: x[1], reverse=True))
+        
+        # Sorted once here, so every consumer can walk the stats in order
+        return dict(sorted(stats_by_base.items(), key=lambda x: x[1]['total'], reverse=True))
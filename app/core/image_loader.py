@@ -0,0 +1,74 @@
+"""
+Image Loader Module
+Converts images to block grids on a worker thread so the UI stays responsive.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Callable, Optional, Tuple
+
+from PIL import Image
+from PySide6.QtCore import QObject, QRunnable
+
+from app.core.events import post_to
+from app.minecraft.image_mapper import ImageToBlockMapper
+from app.minecraft.texturepack.matcher import BlockMatcher
+
+
+class ImageLoadWorker(QRunnable):
+    """
+    Loads, resizes and maps an image to blocks off the GUI thread.
+    
+    Results are handed back by posting ReenterEvents to the receiver, which
+    runs the callbacks on its own (GUI) thread.
+    """
+
+    def __init__(self, file_path: Path, matcher: BlockMatcher, receiver: QObject,
+                 on_progress: Callable[[int], None],
+                 on_finished: Callable[[list, int, int], None],
+                 on_failed: Callable[[str], None],
+                 target_size: Optional[Tuple[int, int]] = None):
+        super().__init__()
+        self.file_path = file_path
+        self.matcher = matcher
+        self.receiver = receiver
+        self.on_progress = on_progress
+        self.on_finished = on_finished
+        self.on_failed = on_failed
+        self.target_size = target_size
+        # The application keeps a reference until the result is delivered
+        self.setAutoDelete(False)
+
+    def run(self):
+        """Runs the conversion; never touches widgets directly."""
+        try:
+            with Image.open(self.file_path) as img:
+                # Resize if needed
+                if self.target_size:
+                    img = img.resize(self.target_size, Image.Resampling.LANCZOS)
+
+                # Convert to RGB
+                if img.mode != 'RGB':
+                    img = img.convert('RGB')
+
+                width, height = img.size
+
+                # Only forward whole-percent changes to the GUI thread
+                last_percent = -1
+
+                def progress_callback(progress: float):
+                    nonlocal last_percent
+                    percent = int(progress * 100)
+                    if percent != last_percent:
+                        last_percent = percent
+                        post_to(self.receiver, lambda: self.on_progress(percent))
+
+                mapper = ImageToBlockMapper(self.matcher)
+                grid = mapper.map_image_to_blocks(img, progress_callback=progress_callback)
+        except Exception as e:
+            message = str(e)
+            post_to(self.receiver, lambda: self.on_failed(message))
+            return
+
+        post_to(self.receiver, lambda: self.on_finished(grid, width, height))
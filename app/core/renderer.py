@@ -2,7 +2,7 @@ from __future__ import annotations
 
 
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import List, Optional, Sequence, Tuple
 
 
 import numpy as np
@@ -27,11 +27,17 @@ class BlockRenderer:
         """
         self.block_size = block_size
         self._texture_cache: dict[str, Image.Image] = {}
+        # Tile atlas: every texture seen so far, composited and packed into one
+        # contiguous (N, size, size, 4) array that renders index into
+        self._tile_index: dict[Path, int] = {}
+        self._tiles: List[np.ndarray] = []
+        self._atlas: Optional[np.ndarray] = None
     
     def render(
         self, 
         block_grid: List[List[BlockTexture]], 
-        output_path: Optional[Path] = None
+        output_path: Optional[Path] = None,
+        compress_level: int = 3
     ) -> Image.Image:
         """
         Renders a grid of blocks into an image.
@@ -39,46 +45,93 @@ class BlockRenderer:
         Args:
             block_grid: 2D grid of BlockTexture (height x width)
             output_path: Optional path to save the image
+            compress_level: zlib level for the saved PNG (0-9; lower is faster)
             
         Returns:
             Rendered PIL Image
         """
-        if not block_grid or not block_grid[0]:
+        output_image = Image.fromarray(self.render_array(block_grid), 'RGBA')
+        
+        # Save if path provided
+        if output_path:
+            self._save(output_image, output_path, compress_level)
+        
+        return output_image
+    
+    def render_ids(
+        self,
+        grid_ids: np.ndarray,
+        blocks: Sequence[BlockTexture],
+        output_path: Optional[Path] = None,
+        compress_level: int = 3
+    ) -> Image.Image:
+        """
+        Renders a grid given as block ids, without walking a list of blocks.
+        
+        Args:
+            grid_ids: (height, width) integer array of indices into blocks
+            blocks: Blocks the ids refer to (e.g. CanvasWidget.get_id_grid)
+            output_path: Optional path to save the image
+            compress_level: zlib level for the saved PNG (0-9; lower is faster)
+            
+        Returns:
+            Rendered PIL Image
+        """
+        if grid_ids.ndim != 2 or grid_ids.size == 0:
             raise ValueError("Empty block grid")
         
-        height = len(block_grid)
-        width = len(block_grid[0])
-        
-        # Create destination image
-        output_width = width * self.block_size
-        output_height = height * self.block_size
-        output_image = Image.new('RGBA', (output_width, output_height), (255, 255, 255, 255))
-        
-        # Render each block
-        for y in range(height):
-            for x in range(width):
-                block = block_grid[y][x]
-                texture = self._load_texture(block)
-                
-                # Position where to paste the texture
-                paste_x = x * self.block_size
-                paste_y = y * self.block_size
-                
-                output_image.paste(texture, (paste_x, paste_y), texture)
+        # Translate block ids to atlas tiles once per block present in the
+        # grid, then gather the whole image through that lookup table
+        present = np.flatnonzero(np.bincount(grid_ids.ravel(), minlength=len(blocks)))
+        tile_lut = np.zeros(len(blocks), dtype=np.int32)
+        tile_index = self._tile_index
+        for block_id in present.tolist():
+            block = blocks[block_id]
+            index = tile_index.get(block.texture_path)
+            if index is None:
+                index = self._add_tile(block)
+            tile_lut[block_id] = index
+        
+        pixels = self._assemble(self._get_atlas(), tile_lut[grid_ids])
+        output_image = Image.fromarray(pixels, 'RGBA')
         
-        # Save if path provided
         if output_path:
-            output_path = Path(output_path)
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-            output_image.save(output_path)
+            self._save(output_image, output_path, compress_level)
         
         return output_image
     
+    def render_array(self, block_grid: List[List[BlockTexture]]) -> np.ndarray:
+        """
+        Renders a grid of blocks into a (height*size, width*size, 4) RGBA array.
+        
+        Args:
+            block_grid: 2D grid of BlockTexture (height x width)
+            
+        Returns:
+            Rendered uint8 array
+        """
+        if not block_grid or not block_grid[0]:
+            raise ValueError("Empty block grid")
+        
+        # Map the grid to indices into the atlas of pre-composited tiles
+        tile_index = self._tile_index
+        grid_ids = np.empty((len(block_grid), len(block_grid[0])), dtype=np.int32)
+        for y, row in enumerate(block_grid):
+            ids_row = grid_ids[y]
+            for x, block in enumerate(row):
+                index = tile_index.get(block.texture_path)
+                if index is None:
+                    index = self._add_tile(block)
+                ids_row[x] = index
+        
+        return self._assemble(self._get_atlas(), grid_ids)
+    
     def render_with_grid(
         self,
         block_grid: List[List[BlockTexture]],
         output_path: Optional[Path] = None,
-        grid_color: Tuple[int, int, int, int] = (128, 128, 128, 128)
+        grid_color: Tuple[int, int, int, int] = (128, 128, 128, 128),
+        compress_level: int = 1
     ) -> Image.Image:
         """
         Renders the image with visible grid lines between blocks.
@@ -87,42 +140,24 @@ class BlockRenderer:
             block_grid: 2D grid of BlockTexture
             output_path: Optional path to save
             grid_color: RGBA color of grid lines
+            compress_level: zlib level for the saved PNG (0-9; lower is faster)
             
         Returns:
             Rendered PIL Image with grid
         """
-        # Render base image
-        image = self.render(block_grid, output_path=None)
-        
-        # Add grid lines
-        from PIL import ImageDraw
-        draw = ImageDraw.Draw(image, 'RGBA')
-        
-        height = len(block_grid)
-        width = len(block_grid[0])
-        
-        # Vertical lines
-        for x in range(width + 1):
-            x_pos = x * self.block_size
-            draw.line(
-                [(x_pos, 0), (x_pos, height * self.block_size)],
-                fill=grid_color,
-                width=1
-            )
-        
-        # Horizontal lines
-        for y in range(height + 1):
-            y_pos = y * self.block_size
-            draw.line(
-                [(0, y_pos), (width * self.block_size, y_pos)],
-                fill=grid_color,
-                width=1
-            )
+        # Render base image once and write the lines into the array
+        pixels = self.render_array(block_grid)
+        size = self.block_size
+        
+        # Drawing RGBA onto an RGBA image replaces pixels rather than
+        # blending them, so the lines are plain grid_color writes
+        pixels[:, ::size] = grid_color
+        pixels[::size, :] = grid_color
+        
+        image = Image.fromarray(pixels, 'RGBA')
         
         if output_path:
-            output_path = Path(output_path)
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-            image.save(output_path)
+            self._save(image, output_path, compress_level)
         
         return image
     
@@ -198,6 +233,52 @@ class BlockRenderer:
         
         return False
     
+    @staticmethod
+    def _save(image: Image.Image, output_path: Path, compress_level: int) -> None:
+        """Saves a rendered image as PNG, creating the parent folder."""
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        image.save(output_path, compress_level=compress_level, optimize=False)
+    
+    def _assemble(self, tiles: np.ndarray, grid_ids: np.ndarray) -> np.ndarray:
+        """
+        Builds the output array from a (N, size, size, 4) tile stack and a grid of tile ids.
+        
+        The whole image is produced by one gather and one reshape instead of a
+        paste per block.
+        """
+        height, width = grid_ids.shape
+        size = self.block_size
+        out = tiles[grid_ids]  # (height, width, size, size, 4)
+        out = out.transpose(0, 2, 1, 3, 4).reshape(height * size, width * size, 4)
+        return np.ascontiguousarray(out)
+    
+    def _add_tile(self, block: BlockTexture) -> int:
+        """
+        Composites a block's texture over white and appends it to the atlas.
+        
+        Tiles never overlap, so pasting a texture with itself as mask onto a
+        white canvas gives the same pixels for every occurrence; doing it once
+        per texture matches the per-block paste exactly.
+        
+        Returns:
+            Index of the new tile in the atlas
+        """
+        texture = self._load_texture(block)
+        tile = Image.new('RGBA', (self.block_size, self.block_size), (255, 255, 255, 255))
+        tile.paste(texture, (0, 0), texture)
+        
+        index = len(self._tiles)
+        self._tiles.append(np.asarray(tile))
+        self._tile_index[block.texture_path] = index
+        return index
+    
+    def _get_atlas(self) -> np.ndarray:
+        """Returns the packed tile atlas, restacking only after new tiles were added."""
+        if self._atlas is None or len(self._atlas) != len(self._tiles):
+            self._atlas = np.stack(self._tiles)
+        return self._atlas
+    
     def _load_texture(self, block: BlockTexture) -> Image.Image:
         """
         Loads and caches a block's texture.
@@ -214,11 +295,19 @@ class BlockRenderer:
             texture = Image.open(block.texture_path).convert('RGBA')
             
             # Resize to standard size if necessary
-            if texture.size != (self.block_size, self.block_size):
-                texture = texture.resize(
-                    (self.block_size, self.block_size),
-                    Image.Resampling.NEAREST
-                )
+            size = self.block_size
+            width, height = texture.size
+            if (width, height) != (size, size):
+                if width % size == 0 and height % size == 0:
+                    # Whole-multiple sizes (HD packs, animation strips): NEAREST
+                    # is plain decimation at pixel centers on each axis, which
+                    # a strided slice does without a resize
+                    step_x = width // size
+                    step_y = height // size
+                    pixels = np.asarray(texture)[step_y // 2::step_y, step_x // 2::step_x]
+                    texture = Image.fromarray(np.ascontiguousarray(pixels), 'RGBA')
+                else:
+                    texture = texture.resize((size, size), Image.Resampling.NEAREST)
             
             self._texture_cache[cache_key] = texture
         
@@ -226,4 +315,7 @@ class BlockRenderer:
     
     def clear_cache(self) -> None:
         """Clears texture cache to free memory."""
-        self._texture_cache.clear()
\ No newline at end of file
+        self._texture_cache.clear()
+        self._tile_index.clear()
+        self._tiles.clear()
+        self._atlas = None
\ No newline at end of file
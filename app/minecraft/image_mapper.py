@@ -2,97 +2,153 @@ from __future__ import annotations
 
 
 from pathlib import Path
-from typing import List
+from typing import List, Tuple, Union
 
 
 import numpy as np
 from PIL import Image
-from skimage import color
 
 
+from app.minecraft.texturepack.analyzer import INV255
 from app.minecraft.texturepack.matcher import BlockMatcher
 from app.minecraft.texturepack.models import BlockTexture
 
 class ImageToBlockMapper:
+    # Target size of one pixel x block distance tile (about an L2 cache)
+    MATCH_TILE_BYTES = 1 << 20
+    # Lower bound so per-tile Python overhead stays small for large block sets
+    MIN_TILE_PIXELS = 512
+
     def __init__(self, matcher: BlockMatcher):
         self.matcher = matcher
 
+    @property
+    def blocks_by_id(self) -> Tuple[BlockTexture, ...]:
+        """Blocks indexed by the ids stored in grids from map_image_to_ids."""
+        return tuple(self.matcher.blocks)
+
     
-    def map_image(self, image_path: Path, *, target_size: tuple[int, int] | None = None, 
+    def map_image(self, image: Union[Path, Image.Image, np.ndarray], *,
+                  target_size: tuple[int, int] | None = None,
                   progress_callback=None) -> List[List[BlockTexture]]:
         """
         Maps an image to Minecraft blocks.
         
         Args:
-            image_path: Path to the image
+            image: Path to the image, or an already opened PIL Image / RGB array
+                   (avoids decoding the file a second time)
             target_size: Optional target size (width, height)
             progress_callback: Optional callback function(progress: float) called with 0.0-1.0
         
         Returns:
             Grid of BlockTexture objects
         """
-        with Image.open(image_path) as img:
-            img = img.convert("RGB")
+        if isinstance(image, np.ndarray):
+            if target_size is not None:
+                image = Image.fromarray(image)
+            else:
+                grid_ids = self.map_image_to_ids(image, progress_callback=progress_callback)
+                return self.ids_to_grid(grid_ids)
 
+        if isinstance(image, Image.Image):
+            img = image.convert("RGB")
             if target_size is not None:
                 img = img.resize(target_size, Image.NEAREST)
-            
-            rgb = np.array(img)
+            grid_ids = self.map_image_to_ids(img, progress_callback=progress_callback)
+            return self.ids_to_grid(grid_ids)
 
-        rgb_norm = rgb.astype(np.float32) / 255.0
-        lab = color.rgb2lab(rgb_norm)
-
-        height, width, _ = lab.shape
-
-        grid: List[List[BlockTexture]] = []
+        with Image.open(image) as img:
+            img = img.convert("RGB")
 
-        for y in range(height):
-            row: List[BlockTexture] = []
-            for x in range(width):
-                pixel_lab = tuple(lab[y, x])
-                block = self.matcher.match_lab(pixel_lab)
-                row.append(block)
-            
-            grid.append(row)
+            if target_size is not None:
+                img = img.resize(target_size, Image.NEAREST)
             
-            # Update progress
-            if progress_callback:
-                progress = (y + 1) / height
-                progress_callback(progress)
-        
-        return grid
+            grid_ids = self.map_image_to_ids(img, progress_callback=progress_callback)
+
+        return self.ids_to_grid(grid_ids)
     
-    def map_image_to_blocks(self, img: Image.Image, progress_callback=None) -> List[List[BlockTexture]]:
+    def map_image_to_blocks(self, img: Union[Image.Image, np.ndarray], progress_callback=None) -> List[List[BlockTexture]]:
         """
         Maps a PIL Image to Minecraft blocks.
         
         Args:
-            img: PIL Image (RGB mode)
+            img: PIL Image (RGB mode) or (height, width, 3) uint8 RGB array
             progress_callback: Optional callback function(progress: float) called with 0.0-1.0
         
         Returns:
             Grid of BlockTexture objects
         """
-        img = img.convert("RGB")
-        rgb = np.array(img)
-        rgb_norm = rgb.astype(np.float32) / 255.0
-        lab = color.rgb2lab(rgb_norm)
-
-        height, width, _ = lab.shape
-        grid: List[List[BlockTexture]] = []
-
-        for y in range(height):
-            row: List[BlockTexture] = []
-            for x in range(width):
-                pixel_lab = tuple(lab[y, x])
-                block = self.matcher.match_lab(pixel_lab)
-                row.append(block)
-            
-            grid.append(row)
+        grid_ids = self.map_image_to_ids(img, progress_callback=progress_callback)
+        return self.ids_to_grid(grid_ids)
+    
+    def map_image_to_ids(self, img: Union[Image.Image, np.ndarray], progress_callback=None) -> np.ndarray:
+        """
+        Maps a PIL Image to block ids.
+        
+        Args:
+            img: PIL Image (RGB mode) or (height, width, 3) uint8 RGB array
+            progress_callback: Optional callback function(progress: float) called with 0.0-1.0
+        
+        Returns:
+            (height, width) uint16 array of indices into blocks_by_id
+        """
+        if isinstance(img, np.ndarray):
+            rgb = img[..., :3]
+        else:
+            rgb = np.asarray(img.convert("RGB"))
+        height, width = rgb.shape[:2]
+        
+        # Images repeat colors heavily: match each distinct RGB value once
+        # (packed one uint8 channel at a time, so only a single uint32 plane is
+        # live instead of a full uint32 copy of the image)
+        packed = rgb[..., 0].astype(np.uint32)
+        packed <<= 8
+        packed |= rgb[..., 1]
+        packed <<= 8
+        packed |= rgb[..., 2]
+        packed = packed.ravel()
+        colors, inverse = np.unique(packed, return_inverse=True)
+        ids = self._match_colors(colors, progress_callback)
+        return ids.astype(np.uint16)[inverse.ravel()].reshape(height, width)
+    
+    def _match_colors(self, colors: np.ndarray, progress_callback=None) -> np.ndarray:
+        """
+        Finds the closest block for each packed 0xRRGGBB color.
+        
+        Returns:
+            Array of indices into blocks_by_id, one per color
+        """
+        # skimage is slow to import; defer it until an image is actually mapped
+        from skimage import color
+        
+        rgb = np.empty((len(colors), 1, 3), dtype=np.float32)
+        rgb[:, 0, 0] = (colors >> 16) & 0xFF
+        rgb[:, 0, 1] = (colors >> 8) & 0xFF
+        rgb[:, 0, 2] = colors & 0xFF
+        rgb *= INV255
+        pixels = color.rgb2lab(rgb).reshape(-1, 3).astype(np.float32)
+        total = pixels.shape[0]
+        
+        matcher = self.matcher
+        num_blocks = len(matcher.blocks)
+        ids = np.empty(total, dtype=np.int32)
+        
+        # Size tiles so the pixel x block score tile stays cache resident,
+        # and reuse one buffer for every tile
+        tile_pixels = max(self.MIN_TILE_PIXELS, self.MATCH_TILE_BYTES // (num_blocks * 4))
+        d2_buffer = np.empty((min(tile_pixels, total), num_blocks), dtype=np.float32)
+        
+        for start in range(0, total, tile_pixels):
+            tile = pixels[start:start + tile_pixels]
+            ids[start:start + len(tile)] = matcher.find_closest_batch(tile, out=d2_buffer[:len(tile)])
             
             # Update progress
             if progress_callback:
-                progress = (y + 1) / height
-                progress_callback(progress)
+                progress_callback((start + len(tile)) / total)
         
-        return grid
\ No newline at end of file
+        return ids
+    
+    def ids_to_grid(self, grid_ids: np.ndarray) -> List[List[BlockTexture]]:
+        """Expands a block id array into the BlockTexture grid used by the canvas."""
+        blocks = self.blocks_by_id
+        return [[blocks[i] for i in row] for row in grid_ids.tolist()]
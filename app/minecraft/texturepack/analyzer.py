@@ -1,17 +1,24 @@
 from __future__ import annotations
 
 
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Iterable
+from typing import Iterable, Optional
 
 
 import numpy as np
 from PIL import Image
-from skimage import color
 
 
 from .models import BlockTexture
 
+
+# 8-bit to [0, 1] scale for LAB conversion, as a multiply (cheaper per lane
+# than a divide). Not bit-identical to "/ 255.0": results can differ in the
+# last float32 place. Shared with the image mapper
+INV255 = np.float32(1.0 / 255.0)
+
 class TextureAnalyzer:
     def __init__(self, transparency_threshold: float = 0.05):
         """
@@ -23,52 +30,78 @@ class TextureAnalyzer:
         """
         self.transparency_threshold = transparency_threshold
     
-    def analyze(self, blocks: Iterable[BlockTexture]) -> None:
-        for block in blocks:
-            # Detect transparency first
-            has_transparency = self._has_transparency(block.texture_path)
-            block.has_transparency = has_transparency
-            
-            # Only compute colors if texture is solid (no transparency)
-            if not has_transparency:
-                avg_rgb = self._compute_average_rgb(block.texture_path)
-                lab = self._rgb_to_lab(avg_rgb)
-                block.avg_color = avg_rgb
+    def analyze(self, blocks: Iterable[BlockTexture], max_workers: Optional[int] = None) -> None:
+        """
+        Analyzes all blocks in place, fanning the texture work out over a thread pool.
+        
+        Args:
+            blocks: Blocks to analyze
+            max_workers: Worker threads (default: one per CPU)
+        """
+        blocks = list(blocks)
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+        
+        if max_workers <= 1 or len(blocks) < 2:
+            for block in blocks:
+                self._analyze_block(block)
+        else:
+            # PNG decoding releases the GIL, so threads overlap the per-texture I/O
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                for _ in executor.map(self._analyze_block, blocks):
+                    pass
+        
+        # Convert every solid block's average color to LAB in one vectorized call
+        solid = [b for b in blocks if b.avg_color is not None]
+        if solid:
+            for block, lab in zip(solid, self._rgb_to_lab_batch([b.avg_color for b in solid])):
                 block.lab_color = lab
-            else:
-                # Set to None for transparent textures
-                block.avg_color = None
-                block.lab_color = None
+    
+    def _analyze_block(self, block: BlockTexture) -> None:
+        # Decode the texture once for both checks
+        data = self._load_rgba(block.texture_path)
+        
+        # Detect transparency first
+        has_transparency = self._has_transparency(data)
+        block.has_transparency = has_transparency
+        
+        # Only compute colors if texture is solid (no transparency)
+        # (LAB is filled in for all solid blocks at once by analyze)
+        if not has_transparency:
+            block.avg_color = self._compute_average_rgb(data)
+            block.lab_color = None
+        else:
+            # Set to None for transparent textures
+            block.avg_color = None
+            block.lab_color = None
 
     
-    def _has_transparency(self, texture_path: Path) -> bool:
+    @staticmethod
+    def _load_rgba(texture_path: Path) -> np.ndarray:
+        """Decodes a texture into a (height, width, 4) uint8 RGBA array."""
+        with Image.open(texture_path) as img:
+            return np.asarray(img.convert("RGBA"))
+    
+    def _has_transparency(self, data: np.ndarray) -> bool:
         """
         Checks if a texture has significant transparency.
         
         Args:
-            texture_path: Path to the texture file
+            data: RGBA array of the texture
             
         Returns:
             True if texture has transparent pixels above threshold, False otherwise
         """
-        with Image.open(texture_path) as img:
-            img = img.convert("RGBA")
-            data = np.array(img)
-        
         alpha = data[..., 3]
         total_pixels = alpha.size
         
-        # Count pixels with alpha < 255 (transparent or semi-transparent)
-        transparent_pixels = np.sum(alpha < 255)
-        transparency_ratio = transparent_pixels / total_pixels
+        # Count pixels with alpha < 255 (transparent or semi-transparent);
+        # count_nonzero reduces the mask directly instead of summing it as ints
+        transparent_pixels = np.count_nonzero(alpha != 255)
         
-        return transparency_ratio > self.transparency_threshold
+        return transparent_pixels > self.transparency_threshold * total_pixels
     
-    def _compute_average_rgb(self, texture_path: Path) -> tuple[int, int, int]:
-        with Image.open(texture_path) as img:
-            img = img.convert("RGBA")
-            data = np.array(img)
-
+    def _compute_average_rgb(self, data: np.ndarray) -> tuple[int, int, int]:
         rgb = data[..., :3]
         alpha = data[..., 3]
 
@@ -82,9 +115,13 @@ class TextureAnalyzer:
         return tuple(int(c) for c in mean_rgb)
     
 
-    def _rgb_to_lab(self, rgb: tuple[int, int, int]) -> tuple[float, float, float]:
-
-        rgb_arr = np.array([[rgb]], dtype=np.float32) / 255.0
-        lab_arr = color.rgb2lab(rgb_arr)
-        lab = lab_arr[0, 0]
-        return float(lab[0]), float(lab[1]), float(lab[2])
\ No newline at end of file
+    @staticmethod
+    def _rgb_to_lab_batch(rgbs: list[tuple[int, int, int]]) -> list[tuple[float, float, float]]:
+        """Converts a list of RGB colors to LAB with a single rgb2lab call."""
+        # skimage is slow to import; only needed when the analysis cache misses
+        from skimage import color
+        
+        rgb_arr = np.array(rgbs, dtype=np.float32).reshape(-1, 1, 3)
+        rgb_arr *= INV255
+        lab_arr = color.rgb2lab(rgb_arr).reshape(-1, 3)
+        return [(float(l), float(a), float(b)) for l, a, b in lab_arr.tolist()]
\ No newline at end of file
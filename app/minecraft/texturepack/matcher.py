@@ -5,6 +5,9 @@ from typing import Iterable, Optional
 import math
 
 
+import numpy as np
+
+
 from .models import BlockTexture
 
 
@@ -26,23 +29,50 @@ class BlockMatcher:
         if not self.blocks:
             raise ValueError("No blocks with LAB color available for matching")
         
+        # LAB table and squared norms are constant across queries: build them once
+        # float32 halves the table and score traffic and runs on SGEMM; LAB
+        # differences between blocks are far above float32 resolution
+        self.blocks_lab = np.array([b.lab_color for b in self.blocks], dtype=np.float32)
+        self._blocks_lab_t = np.ascontiguousarray(self.blocks_lab.T)
+        self._b_half_norm2 = 0.5 * (self.blocks_lab * self.blocks_lab).sum(axis=1)
+        
 
     def match_rgb(self, rgb: tuple[int, int, int]) -> BlockTexture:
         raise NotImplementedError("Use match_lab() ou converta RGB para LAB antes")
     
 
     def match_lab(self, lab: tuple[float, float, float]) -> BlockTexture:
-        best_block: Optional[BlockTexture] = None
+        return self.blocks[self.match_lab_index(lab)]
+    
+
+    def match_lab_index(self, lab: tuple[float, float, float]) -> int:
+        """Returns the index in self.blocks of the closest block to a LAB color."""
+        best_index = 0
         best_distance = math.inf
 
-        for block in self.blocks:
+        for index, block in enumerate(self.blocks):
             d = self._delta_e(lab, block.lab_color)
 
             if d < best_distance:
                 best_distance = d
-                best_block = block
+                best_index = index
         
-        return best_block
+        return best_index
+    
+
+    def find_closest_batch(self, px_lab: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Returns the index in self.blocks of the closest block to each LAB color.
+        
+        Args:
+            px_lab: (N, 3) float32 array of LAB colors
+            out: Optional (N, len(blocks)) float32 scratch buffer, reused across calls
+        """
+        # |p-b|^2 = |p|^2 - 2 (p.b - |b|^2/2); |p|^2 is the same for every
+        # candidate, so the closest block maximizes p.b - |b|^2/2 (one GEMM)
+        scores = np.matmul(px_lab, self._blocks_lab_t, out=out)
+        scores -= self._b_half_norm2
+        return scores.argmax(axis=1)
     
 
 
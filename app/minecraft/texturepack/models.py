@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import sys
 from dataclasses import dataclass, asdict
 from pathlib import Path
 from typing import Optional, Tuple
@@ -7,7 +8,11 @@ from typing import Optional, Tuple
 RGB = Tuple[int, int, int]
 LAB = Tuple[float, float, float]
 
-@dataclass
+# Thousands of blocks are created per pack and their fields are read in every
+# hot loop; slots drop the per-instance dict (dataclass slots need 3.10+)
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(**_SLOTS)
 class BlockTexture:
 
     block_id: str
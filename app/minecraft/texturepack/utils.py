@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+import os
 from pathlib import Path
 from typing import Iterable, Set
 
 VALID_IMAGE_EXTENSIONS = {".png"}
+# Same extensions without the leading dot, for matching raw file names
+VALID_IMAGE_SUFFIXES = {ext[1:] for ext in VALID_IMAGE_EXTENSIONS}
 
 def is_valid_texture_file(path: Path) -> bool:
     return path.is_file() and path.suffix.lower() in VALID_IMAGE_EXTENSIONS
@@ -95,8 +98,13 @@ def iter_block_texture_files(texturepack_root: Path, ignore_non_blocks: bool = T
     # Load list of ignored textures
     ignored_textures = load_ignored_textures() if ignore_non_blocks else set()
 
-    for path in block_dir.rglob("*"):
-        if is_valid_texture_file(path):
+    # One os.walk pass: scandir entries carry the file type, so no per-file stat
+    # is needed, and the extension check is case-insensitive
+    for dir_path, _, file_names in os.walk(block_dir):
+        for file_name in file_names:
+            if file_name.rpartition('.')[2].lower() not in VALID_IMAGE_SUFFIXES:
+                continue
+            path = Path(dir_path, file_name)
             if not should_ignore_texture(path, ignored_textures):
                 yield path
 
@@ -11,11 +11,10 @@ from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
     QLineEdit, QScrollArea, QPushButton, QGridLayout
 )
-from PySide6.QtCore import Qt, Signal, QSize
-from PySide6.QtGui import QPixmap, QImage, QColor
-from PIL import Image
-
+from PySide6.QtCore import Qt, Signal, QSize, QTimer
+from PySide6.QtGui import QPixmap, QColor
 from app.minecraft.texturepack.models import BlockTexture
+from app.ui.thumbnails import get_thumbnail
 
 
 class BlockPalette(QWidget):
@@ -24,15 +23,22 @@ class BlockPalette(QWidget):
     # Signals
     block_selected = Signal(object)  # Emits BlockTexture
     
+    # Buttons created per event-loop pass while filling the list
+    CHUNK_SIZE = 64
+    
     def __init__(self, width: int = 280, height: int = 400):
         super().__init__()
         
         self._blocks: List[BlockTexture] = []
         self._selected_block: Optional[BlockTexture] = None
-        self._texture_cache: dict[str, QPixmap] = {}
         self._search_filter: str = ""
         self._block_buttons: List[QPushButton] = []
         
+        # Blocks still waiting for a button, filled in idle chunks
+        self._pending_blocks: List[BlockTexture] = []
+        self._pending_index: int = 0
+        self._chunk_scheduled: bool = False
+        
         self.setMinimumSize(width, height)
         self.setMaximumWidth(width + 50)
         
@@ -78,7 +84,6 @@ class BlockPalette(QWidget):
     def set_blocks(self, blocks: List[BlockTexture]):
         """Sets the available blocks."""
         self._blocks = blocks
-        self._load_textures()
         self._update_block_list()
     
     def set_selected_block(self, block: Optional[BlockTexture]):
@@ -96,45 +101,30 @@ class BlockPalette(QWidget):
         self._search_filter = text.lower()
         self._update_block_list()
     
-    def _load_textures(self):
-        """Pre-loads block textures."""
-        for block in self._blocks[:100]:  # Limit for performance
-            if block.block_id not in self._texture_cache:
-                self._load_texture(block)
-    
     def _load_texture(self, block: BlockTexture) -> QPixmap:
-        """Loads a block texture."""
-        if block.block_id in self._texture_cache:
-            return self._texture_cache[block.block_id]
-        
-        try:
-            if block.texture_path.exists():
-                pil_img = Image.open(block.texture_path).convert('RGBA')
-                pil_img = pil_img.resize((24, 24), Image.Resampling.NEAREST)
-                data = pil_img.tobytes("raw", "RGBA")
-                qimage = QImage(data, 24, 24, QImage.Format.Format_RGBA8888)
-                pixmap = QPixmap.fromImage(qimage)
-            else:
-                color = block.avg_color if block.avg_color else (255, 0, 255)
-                qimage = QImage(24, 24, QImage.Format.Format_RGBA8888)
-                qimage.fill(QColor(*color))
-                pixmap = QPixmap.fromImage(qimage)
-        except Exception:
-            color = block.avg_color if block.avg_color else (255, 0, 255)
-            qimage = QImage(24, 24, QImage.Format.Format_RGBA8888)
-            qimage.fill(QColor(*color))
-            pixmap = QPixmap.fromImage(qimage)
-        
-        self._texture_cache[block.block_id] = pixmap
+        """Loads a block texture from the shared thumbnail cache."""
+        pixmap = get_thumbnail(block.texture_path, 24)
+        if pixmap is not None:
+            return pixmap
+        
+        # Fall back to a swatch of the block's average color, filled on the
+        # pixmap itself (no intermediate image buffer to copy over)
+        color = block.avg_color if block.avg_color else (255, 0, 255)
+        pixmap = QPixmap(24, 24)
+        pixmap.fill(QColor(*color))
         return pixmap
     
     def _update_block_list(self):
         """Updates the displayed block list based on filter."""
-        # Clear existing buttons
-        while self.blocks_layout.count():
-            child = self.blocks_layout.takeAt(0)
-            if child.widget():
-                child.widget().deleteLater()
+        # Clear existing buttons as one batch, without a repaint per removal
+        self.blocks_widget.setUpdatesEnabled(False)
+        try:
+            while self.blocks_layout.count():
+                child = self.blocks_layout.takeAt(0)
+                if child.widget():
+                    child.widget().deleteLater()
+        finally:
+            self.blocks_widget.setUpdatesEnabled(True)
         
         self._block_buttons.clear()
         
@@ -144,17 +134,33 @@ class BlockPalette(QWidget):
             if not self._search_filter or self._search_filter in b.block_id.lower()
         ]
         
-        # Create block buttons
-        for block in filtered_blocks[:200]:  # Limit display
-            self._create_block_button(block)
+        # Create block buttons in chunks so the window can paint in between
+        self._pending_blocks = filtered_blocks[:200]  # Limit display
+        self._pending_index = 0
+        if self._pending_blocks and not self._chunk_scheduled:
+            self._chunk_scheduled = True
+            QTimer.singleShot(0, self._populate_chunk)
+    
+    def _populate_chunk(self):
+        """Creates the next chunk of block buttons and reschedules itself."""
+        self._chunk_scheduled = False
+        end = min(self._pending_index + self.CHUNK_SIZE, len(self._pending_blocks))
+        
+        self.blocks_widget.setUpdatesEnabled(False)
+        try:
+            for block in self._pending_blocks[self._pending_index:end]:
+                self._create_block_button(block)
+        finally:
+            self.blocks_widget.setUpdatesEnabled(True)
+        self._pending_index = end
+        
+        if end < len(self._pending_blocks):
+            self._chunk_scheduled = True
+            QTimer.singleShot(0, self._populate_chunk)
     
     def _create_block_button(self, block: BlockTexture):
         """Creates a button for a block."""
-        # Ensure texture is loaded
-        if block.block_id not in self._texture_cache:
-            self._load_texture(block)
-        
-        pixmap = self._texture_cache.get(block.block_id)
+        pixmap = self._load_texture(block)
         
         # Create button with horizontal layout
         button_widget = QWidget()
@@ -170,6 +176,8 @@ class BlockPalette(QWidget):
             btn.setIconSize(QSize(24, 24))
         btn.clicked.connect(lambda checked, b=block: self._on_block_clicked(b))
         btn.setProperty("block_id", block.block_id)
+        if self._selected_block and block.block_id == self._selected_block.block_id:
+            btn.setStyleSheet("background-color: #4080ff; border: 2px solid #60a0ff;")
         button_layout.addWidget(btn)
         
         # Block name label
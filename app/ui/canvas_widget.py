@@ -7,13 +7,15 @@ from __future__ import annotations
 
 from typing import Optional, Tuple, List, Dict
 from pathlib import Path
-from PIL import Image
+
+import numpy as np
 
 from PySide6.QtWidgets import QGraphicsView, QGraphicsScene, QGraphicsPixmapItem
-from PySide6.QtCore import Qt, QPointF, QRectF, Signal
+from PySide6.QtCore import Qt, QPoint, QPointF, QRectF, Signal, QTimer
 from PySide6.QtGui import QPixmap, QImage, QPainter, QPen, QColor
 
 from app.minecraft.texturepack.models import BlockTexture
+from app.ui.thumbnails import FAST_TRANSFORM, decode_images
 
 
 class CanvasWidget(QGraphicsView):
@@ -24,7 +26,7 @@ class CanvasWidget(QGraphicsView):
     """
     
     # Signals
-    block_changed = Signal(int, int, object)
+    block_batch_changed = Signal(list)  # [(x, y, block), ...] painted since the last flush
     selection_changed = Signal(int, int)
     
     def __init__(self, width: int = 800, height: int = 600):
@@ -50,10 +52,18 @@ class CanvasWidget(QGraphicsView):
         self._grid_width: int = 0
         self._grid_height: int = 0
         
+        # Parallel int32 id map of the grid into _block_table, so counting
+        # blocks is a single bincount instead of a walk over the lists
+        self._grid_ids: Optional[np.ndarray] = None
+        self._block_table: List[BlockTexture] = []
+        self._block_index: Dict[str, int] = {}
+        # Bumped on every grid edit, so derived data (e.g. statistics) can be reused
+        self.grid_version: int = 0
+        
         # Block rendering
         self._block_size: int = 16
         self._block_items: List[List[QGraphicsPixmapItem]] = []
-        self._texture_cache: Dict[str, QPixmap] = {}
+        self._texture_cache: Dict[Path, QPixmap] = {}
         
         # Zoom
         self._zoom_level: float = 1.0
@@ -92,6 +102,22 @@ class CanvasWidget(QGraphicsView):
         
         # Hover highlight
         self._hover_highlight_item: Optional[QGraphicsPixmapItem] = None
+        self._hover_brush_size: int = 0
+        
+        # Painted cells are reported in batches (~60 per second) instead of per cell
+        self._pending_changes: List[Tuple[int, int, BlockTexture]] = []
+        self._changes_timer = QTimer(self)
+        self._changes_timer.setSingleShot(True)
+        self._changes_timer.setInterval(16)
+        self._changes_timer.timeout.connect(self._flush_changes)
+        
+        # Pan motion is accumulated and scrolled once per frame, however many
+        # mouse moves arrive in between
+        self._pending_pan = QPoint()
+        self._pan_timer = QTimer(self)
+        self._pan_timer.setSingleShot(True)
+        self._pan_timer.setInterval(16)
+        self._pan_timer.timeout.connect(self._flush_pan)
     
     def set_grid(self, grid: List[List[BlockTexture]]) -> None:
         """Sets the block grid."""
@@ -103,29 +129,49 @@ class CanvasWidget(QGraphicsView):
         self._hover_highlight_item = None
         self._current_hover_block = (-1, -1)
         
+        # Changes to the previous grid are no longer meaningful
+        self._changes_timer.stop()
+        self._pending_changes = []
+        
+        self._block_table = []
+        self._block_index = {}
+        self.grid_version += 1
+        
         if not grid or not grid[0]:
             self._grid = []
             self._grid_width = 0
             self._grid_height = 0
+            self._grid_ids = None
             return
         
         self._grid = grid
         self._grid_height = len(grid)
         self._grid_width = len(grid[0])
+        self._grid_ids = np.empty((self._grid_height, self._grid_width), dtype=np.int32)
         
-        # Create items
+        # Index the grid first, so the textures it needs are known up front
+        index_of = self._index_block
+        grid_ids = self._grid_ids
+        for y in range(self._grid_height):
+            grid_ids[y] = [index_of(block) for block in grid[y]]
+        
+        # Decode every texture not seen before in parallel, then look up one
+        # pixmap per distinct block instead of one per cell
+        self._prefetch_textures(self._block_table)
+        pixmaps = [self._get_texture(block) for block in self._block_table]
+        
+        # Create items (lookups hoisted out of the per-cell loop)
         self._block_items = []
+        block_size = self._block_size
+        add_item = self.scene.addItem
         for y in range(self._grid_height):
             row = []
-            for x in range(self._grid_width):
-                block = grid[y][x]
-                pixmap = self._get_texture(block)
+            for x, block_index in enumerate(self._grid_ids[y].tolist()):
+                item = QGraphicsPixmapItem(pixmaps[block_index])
+                item.setPos(x * block_size, y * block_size)
+                item.setTransformationMode(FAST_TRANSFORM)
                 
-                item = QGraphicsPixmapItem(pixmap)
-                item.setPos(x * self._block_size, y * self._block_size)
-                item.setTransformationMode(Qt.TransformationMode.FastTransformation)
-                
-                self.scene.addItem(item)
+                add_item(item)
                 row.append(item)
             
             self._block_items.append(row)
@@ -155,34 +201,102 @@ class CanvasWidget(QGraphicsView):
                 return
             
             self._grid[y][x] = block
+            self._grid_ids[y, x] = self._index_block(block)
+            self.grid_version += 1
             pixmap = self._get_texture(block)
             self._block_items[y][x].setPixmap(pixmap)
             
-            self.block_changed.emit(x, y, block)
+            self._pending_changes.append((x, y, block))
+            if not self._changes_timer.isActive():
+                self._changes_timer.start()
+    
+    def _index_block(self, block: BlockTexture) -> int:
+        """Returns the id of a block in _block_table, adding it on first use."""
+        index = self._block_index.get(block.block_id)
+        if index is None:
+            index = len(self._block_table)
+            self._block_index[block.block_id] = index
+            self._block_table.append(block)
+        return index
+    
+    def get_id_grid(self) -> Tuple[Optional[np.ndarray], List[BlockTexture]]:
+        """
+        Returns the grid as (height, width) int32 ids and the blocks they index.
+        
+        The array is the canvas's own; callers must not modify it.
+        """
+        return self._grid_ids, self._block_table
+    
+    def get_block_counts(self) -> List[Tuple[BlockTexture, int]]:
+        """Returns (block, number of cells) for every block present in the grid."""
+        if self._grid_ids is None:
+            return []
+        counts = np.bincount(self._grid_ids.ravel(), minlength=len(self._block_table))
+        table = self._block_table
+        return [(table[i], int(counts[i])) for i in np.flatnonzero(counts)]
+    
+    def _flush_pan(self) -> None:
+        """Scrolls by all pan motion accumulated since the last flush."""
+        self._pan_timer.stop()
+        delta = self._pending_pan
+        if delta.isNull():
+            return
+        self._pending_pan = QPoint()
+        
+        self.horizontalScrollBar().setValue(
+            self.horizontalScrollBar().value() - delta.x()
+        )
+        self.verticalScrollBar().setValue(
+            self.verticalScrollBar().value() - delta.y()
+        )
+    
+    def _flush_changes(self) -> None:
+        """Emits all cells painted since the last flush as one batch."""
+        self._changes_timer.stop()
+        if self._pending_changes:
+            changes, self._pending_changes = self._pending_changes, []
+            self.block_batch_changed.emit(changes)
+    
+    def _prefetch_textures(self, blocks: List[BlockTexture]) -> None:
+        """Decodes the uncached textures of blocks on the shared decoder pool."""
+        pending = {}
+        for block in blocks:
+            if block.texture_path not in self._texture_cache:
+                pending.setdefault(block.texture_path, block)
+        if len(pending) < 2:
+            return
+        
+        # QImage decoding is thread-safe; pixmaps are made here, on the GUI thread
+        for block, qimage in zip(pending.values(), decode_images(pending)):
+            self._get_texture(block, qimage)
     
-    def _get_texture(self, block: BlockTexture) -> QPixmap:
-        """Loads and caches texture."""
-        if block.block_id in self._texture_cache:
-            return self._texture_cache[block.block_id]
-        
-        try:
-            if block.texture_path.exists():
-                pil_img = Image.open(block.texture_path).convert('RGBA')
-                data = pil_img.tobytes("raw", "RGBA")
-                qimage = QImage(data, pil_img.width, pil_img.height, QImage.Format.Format_RGBA8888)
-                pixmap = QPixmap.fromImage(qimage)
-            else:
-                color = block.avg_color if block.avg_color else (255, 0, 255)
-                qimage = QImage(self._block_size, self._block_size, QImage.Format.Format_RGBA8888)
-                qimage.fill(QColor(*color))
-                pixmap = QPixmap.fromImage(qimage)
-        except:
+    def _get_texture(self, block: BlockTexture, qimage: Optional[QImage] = None) -> QPixmap:
+        """
+        Loads and caches texture.
+        
+        Args:
+            block: Block whose texture is wanted
+            qimage: Already decoded texture (skips decoding the file again)
+        """
+        # Keyed by file, so block ids that share a PNG share one pixmap
+        pixmap = self._texture_cache.get(block.texture_path)
+        if pixmap is not None:
+            return pixmap
+        
+        # Qt decodes the PNG straight into the image buffer; no PIL decode
+        # plus raw bytes copy in between. A missing or broken file gives a null
+        # image rather than raising, so one null check covers every failure
+        if qimage is None:
+            qimage = QImage(str(block.texture_path))
+        if qimage.isNull():
+            # Average color swatch, filled on the pixmap directly
             color = block.avg_color if block.avg_color else (255, 0, 255)
-            qimage = QImage(self._block_size, self._block_size, QImage.Format.Format_RGBA8888)
-            qimage.fill(QColor(*color))
+            pixmap = QPixmap(self._block_size, self._block_size)
+            pixmap.fill(QColor(*color))
+        else:
             pixmap = QPixmap.fromImage(qimage)
         
-        self._texture_cache[block.block_id] = pixmap
+        self._texture_cache[block.texture_path] = pixmap
         return pixmap
     
     def set_zoom(self, zoom: float) -> None:
@@ -312,8 +426,6 @@ class CanvasWidget(QGraphicsView):
             if 0 <= grid_x < self._grid_width and 0 <= grid_y < self._grid_height:
                 self._last_drawn_block = (grid_x, grid_y)
                 
-                print(f"[DEBUG] Mouse click at ({grid_x}, {grid_y}), active_tool={self._active_tool}, current_block={self._current_block.block_id if self._current_block else 'None'}")
-                
                 if self._active_tool:
                     self._active_tool.on_mouse_down(self, grid_x, grid_y, "left")
                 elif self._current_block:
@@ -328,15 +440,10 @@ class CanvasWidget(QGraphicsView):
     def mouseMoveEvent(self, event):
         """Mouse move handler."""
         if self._is_panning:
-            delta = event.pos() - self._pan_start_pos
+            self._pending_pan += event.pos() - self._pan_start_pos
             self._pan_start_pos = event.pos()
-            
-            self.horizontalScrollBar().setValue(
-                self.horizontalScrollBar().value() - delta.x()
-            )
-            self.verticalScrollBar().setValue(
-                self.verticalScrollBar().value() - delta.y()
-            )
+            if not self._pan_timer.isActive():
+                self._pan_timer.start()
             
             event.accept()
         elif self._is_drawing and self._current_block:
@@ -374,6 +481,7 @@ class CanvasWidget(QGraphicsView):
         """Mouse release handler."""
         if event.button() == Qt.MouseButton.MiddleButton:
             self._is_panning = False
+            self._flush_pan()
             self.setCursor(Qt.CursorShape.ArrowCursor)
             event.accept()
         elif event.button() == Qt.MouseButton.LeftButton:
@@ -387,6 +495,9 @@ class CanvasWidget(QGraphicsView):
                 if 0 <= grid_x < self._grid_width and 0 <= grid_y < self._grid_height:
                     self._active_tool.on_mouse_up(self, grid_x, grid_y, "left")
             
+            # Report the end of the stroke without waiting for the timer
+            self._flush_changes()
+            
             event.accept()
         else:
             super().mouseReleaseEvent(event)
@@ -442,36 +553,38 @@ class CanvasWidget(QGraphicsView):
     
     def _update_hover_highlight(self, x: int, y: int):
         """Updates hover highlight visual feedback."""
-        # Remove previous highlight
-        if self._hover_highlight_item:
-            self.scene.removeItem(self._hover_highlight_item)
-            self._hover_highlight_item = None
-        
-        # Add new highlight if within bounds
-        if 0 <= x < self._grid_width and 0 <= y < self._grid_height:
-            # Get brush size from active tool (if it has one)
-            brush_size = 1
-            if self._active_tool and hasattr(self._active_tool, 'get_brush_size'):
-                brush_size = self._active_tool.get_brush_size()
-            
-            # Calculate brush area
-            radius = brush_size // 2
-            highlight_width = brush_size * self._block_size
-            highlight_height = brush_size * self._block_size
+        # Hide the highlight outside the grid
+        if not (0 <= x < self._grid_width and 0 <= y < self._grid_height):
+            if self._hover_highlight_item:
+                self._hover_highlight_item.setVisible(False)
+            return
+        
+        # Get brush size from active tool (if it has one)
+        brush_size = 1
+        if self._active_tool and hasattr(self._active_tool, 'get_brush_size'):
+            brush_size = self._active_tool.get_brush_size()
+        
+        # The overlay item is kept and moved; it is only rebuilt when the
+        # brush size changes
+        if self._hover_highlight_item is None or self._hover_brush_size != brush_size:
+            if self._hover_highlight_item:
+                self.scene.removeItem(self._hover_highlight_item)
             
             # Create semi-transparent white overlay for entire brush area
-            highlight_image = QImage(highlight_width, highlight_height, QImage.Format.Format_RGBA8888)
+            highlight_size = brush_size * self._block_size
+            highlight_image = QImage(highlight_size, highlight_size, QImage.Format.Format_RGBA8888)
             highlight_image.fill(QColor(255, 255, 255, 80))  # Semi-transparent white
             
-            # Center the highlight on the cursor position
-            pos_x = (x - radius) * self._block_size
-            pos_y = (y - radius) * self._block_size
-            
-            highlight_pixmap = QPixmap.fromImage(highlight_image)
-            self._hover_highlight_item = QGraphicsPixmapItem(highlight_pixmap)
-            self._hover_highlight_item.setPos(pos_x, pos_y)
+            self._hover_highlight_item = QGraphicsPixmapItem(QPixmap.fromImage(highlight_image))
             self._hover_highlight_item.setZValue(1000)  # On top of everything
             self.scene.addItem(self._hover_highlight_item)
+            self._hover_brush_size = brush_size
+        
+        # Center the highlight on the cursor position
+        radius = brush_size // 2
+        self._hover_highlight_item.setPos((x - radius) * self._block_size,
+                                          (y - radius) * self._block_size)
+        self._hover_highlight_item.setVisible(True)
     
     def get_canvas_info(self) -> dict:
         """Returns canvas info."""
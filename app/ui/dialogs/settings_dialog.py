@@ -4,18 +4,33 @@ Manages block ignore list and application settings.
 """
 
 from __future__ import annotations
-from typing import Set, List, Dict
+from typing import Set, List, Dict, Optional
 from pathlib import Path
+from bisect import bisect_left
+from contextlib import contextmanager
 
 from PySide6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
     QListWidget, QListWidgetItem, QLineEdit, QCheckBox, QGroupBox,
     QScrollArea, QWidget, QFrame, QMessageBox, QSplitter
 )
-from PySide6.QtCore import Qt, Signal
+from PySide6.QtCore import Qt, Signal, QTimer, QSize, QPoint
 from PySide6.QtGui import QPixmap
 
 from app.minecraft.texturepack.models import BlockTexture
+from app.ui.thumbnails import get_thumbnail, prefetch_thumbnails
+
+
+@contextmanager
+def _updates_suspended(*widgets: QWidget):
+    """Suspend repaints on widgets while doing a batch of changes."""
+    for widget in widgets:
+        widget.setUpdatesEnabled(False)
+    try:
+        yield
+    finally:
+        for widget in widgets:
+            widget.setUpdatesEnabled(True)
 
 
 class SettingsDialog(QDialog):
@@ -24,9 +39,26 @@ class SettingsDialog(QDialog):
     settings_changed = Signal()
     re_render_requested = Signal()
     
+    # Quiet time after the last keystroke before the search runs; covers the
+    # gap between keys of normal typing, so a typed word filters once
+    FILTER_DEBOUNCE_MS = 150
+    
     def __init__(self, block_manager, parent=None):
         super().__init__(parent)
         self.block_manager = block_manager
+        
+        # Search text the rows' visibility currently reflects
+        self._applied_search = ""
+        
+        # Base names of each list, kept in row order
+        self._active_bases: List[str] = []
+        self._ignored_bases: List[str] = []
+        
+        # 24x24 thumbnails keyed by texture path, reused across repopulates
+        # Thumbnails are only loaded once a row scrolls into view
+        self._base_textures: Dict[str, Path] = {}
+        self._hydrated_bases: Set[str] = set()
+        
         self.setWindowTitle("Settings - Minepixel Editor")
         self.setModal(True)
         self.resize(900, 600)
@@ -45,7 +77,6 @@ class SettingsDialog(QDialog):
         # Statistics
         self.stats_label = QLabel()
         self.stats_label.setWordWrap(True)
-        self._update_statistics()
         layout.addWidget(self.stats_label)
         
         # Search
@@ -53,53 +84,41 @@ class SettingsDialog(QDialog):
         search_layout.addWidget(QLabel("Search:"))
         self.search_input = QLineEdit()
         self.search_input.setPlaceholderText("Type to filter blocks...")
-        self.search_input.textChanged.connect(self._filter_blocks)
+        self.search_input.textChanged.connect(self._schedule_filter)
         search_layout.addWidget(self.search_input)
         layout.addLayout(search_layout)
         
-        # Splitter with two lists
-        splitter = QSplitter(Qt.Orientation.Horizontal)
-        
-        # Active blocks list
-        active_widget = QWidget()
-        active_layout = QVBoxLayout(active_widget)
-        active_layout.setContentsMargins(0, 0, 0, 0)
+        # Debounce timer so a burst of keystrokes runs a single filter pass
+        self._filter_timer = QTimer(self)
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.setInterval(self.FILTER_DEBOUNCE_MS)
+        self._filter_timer.timeout.connect(self._filter_blocks)
         
-        active_label = QLabel("<b>Active Blocks</b>")
-        active_layout.addWidget(active_label)
+        # Coalesces thumbnail loading requests from scrolling and resizing
+        self._hydrate_timer = QTimer(self)
+        self._hydrate_timer.setSingleShot(True)
+        self._hydrate_timer.setInterval(0)
+        self._hydrate_timer.timeout.connect(self._hydrate_visible_icons)
         
-        self.active_list = QListWidget()
-        self.active_list.setSelectionMode(QListWidget.SelectionMode.ExtendedSelection)
-        active_layout.addWidget(self.active_list)
-        
-        # Button to move to ignored
-        move_to_ignored_btn = QPushButton("→ Ignore Selected")
-        move_to_ignored_btn.clicked.connect(self._move_to_ignored)
-        active_layout.addWidget(move_to_ignored_btn)
+        # Splitter with two lists
+        splitter = QSplitter(Qt.Orientation.Horizontal)
         
+        # Active and ignored panes are built the same way
+        active_widget, self.active_list = self._create_block_pane(
+            "Active Blocks", "→ Ignore Selected", self._move_to_ignored)
         splitter.addWidget(active_widget)
         
-        # Ignored blocks list
-        ignored_widget = QWidget()
-        ignored_layout = QVBoxLayout(ignored_widget)
-        ignored_layout.setContentsMargins(0, 0, 0, 0)
-        
-        ignored_label = QLabel("<b>Ignored Blocks</b>")
-        ignored_layout.addWidget(ignored_label)
-        
-        self.ignored_list = QListWidget()
-        self.ignored_list.setSelectionMode(QListWidget.SelectionMode.ExtendedSelection)
-        ignored_layout.addWidget(self.ignored_list)
-        
-        # Button to move to active
-        move_to_active_btn = QPushButton("← Activate Selected")
-        move_to_active_btn.clicked.connect(self._move_to_active)
-        ignored_layout.addWidget(move_to_active_btn)
-        
+        ignored_widget, self.ignored_list = self._create_block_pane(
+            "Ignored Blocks", "← Activate Selected", self._move_to_active)
         splitter.addWidget(ignored_widget)
         
         layout.addWidget(splitter)
         
+        for block_list in (self.active_list, self.ignored_list):
+            scroll_bar = block_list.verticalScrollBar()
+            scroll_bar.valueChanged.connect(self._schedule_icon_hydration)
+            scroll_bar.rangeChanged.connect(self._schedule_icon_hydration)
+        
         # Bulk actions
         bulk_layout = QHBoxLayout()
         
@@ -134,16 +153,41 @@ class SettingsDialog(QDialog):
         layout.addLayout(button_layout)
         
         self._populate_lists()
+        self._update_statistics()
+    
+    def _create_block_pane(self, title: str, move_text: str, on_move):
+        """Create a titled block list with its move button below it."""
+        widget = QWidget()
+        pane_layout = QVBoxLayout(widget)
+        pane_layout.setContentsMargins(0, 0, 0, 0)
+        
+        pane_layout.addWidget(QLabel(f"<b>{title}</b>"))
+        
+        block_list = QListWidget()
+        block_list.setSelectionMode(QListWidget.SelectionMode.ExtendedSelection)
+        block_list.setIconSize(QSize(24, 24))
+        block_list.setUniformItemSizes(True)
+        pane_layout.addWidget(block_list)
+        
+        move_btn = QPushButton(move_text)
+        move_btn.clicked.connect(on_move)
+        pane_layout.addWidget(move_btn)
+        
+        return widget, block_list
     
     def _load_current_settings(self):
         """Load current settings from block manager."""
-        pass  # Already loaded in _populate_lists
+        # Lists are already filled in _populate_lists; remember the ignore set
+        # the current active blocks and matcher were built from
+        self._initial_ignored = set(self.block_manager.user_ignored_blocks) if self.block_manager else set()
     
     def _update_statistics(self):
         """Update statistics display."""
-        total = len(self.block_manager.all_blocks) if self.block_manager else 0
-        active = len(self.block_manager.active_blocks) if self.block_manager else 0
-        ignored = total - active
+        # Count from the lists themselves: block_manager.active_blocks only
+        # reflects the pending changes after Save
+        active = len(self._active_bases)
+        ignored = len(self._ignored_bases)
+        total = active + ignored
         self.stats_label.setText(
             f"<b>Total Blocks:</b> {total} | "
             f"<b>Active:</b> {active} | "
@@ -155,112 +199,169 @@ class SettingsDialog(QDialog):
         if not self.block_manager or not self.block_manager.all_blocks:
             return
         
-        # Group blocks by base name
-        from collections import defaultdict
-        from app.core.block_manager import BlockManager
-        
-        base_to_blocks = defaultdict(list)
-        for block in self.block_manager.all_blocks:
-            base_name = BlockManager.get_base_block_name(block.block_id)
-            base_to_blocks[base_name].append(block)
-        
-        # Sort base names
-        sorted_bases = sorted(base_to_blocks.keys())
+        # Grouping and sorted base names are cached on the block manager
+        grouped_blocks = self.block_manager.get_grouped_blocks()
+        sorted_bases = self.block_manager.get_sorted_base_names()
         
-        # Clear lists
+        # Clear lists (base names are kept in parallel lists, in row order)
         self.active_list.clear()
         self.ignored_list.clear()
-        
-        # Populate lists
+        self._active_bases.clear()
+        self._ignored_bases.clear()
+        self._base_textures.clear()
+        self._hydrated_bases.clear()
+        self._applied_search = ""
+        
+        # One pass: display name with variant count, thumbnail from the first
+        # variant, and the row's list (ignore set bound to a local)
+        ignored = self.block_manager.user_ignored_blocks
+        active_names = []
+        ignored_names = []
+        base_textures = self._base_textures
         for base_name in sorted_bases:
-            blocks = base_to_blocks[base_name]
-            display_block = blocks[0]
-            
-            # Check if ignored
-            is_ignored = base_name in self.block_manager.user_ignored_blocks
-            
-            # Create display name with variant count
+            group = grouped_blocks[base_name]
+            variants = group['variants']
             display_name = base_name.replace('minecraft:', '')
-            if len(blocks) > 1:
-                display_name += f" ({len(blocks)} variants)"
-            
-            # Create list item
-            item = QListWidgetItem(display_name)
-            item.setData(Qt.ItemDataRole.UserRole, base_name)
+            if len(variants) > 1:
+                display_name += f" ({len(variants)} variants)"
+            base_textures[base_name] = group['blocks'][variants[0]].texture_path
+            if base_name in ignored:
+                self._ignored_bases.append(base_name)
+                ignored_names.append(display_name)
+            else:
+                self._active_bases.append(base_name)
+                active_names.append(display_name)
+        
+        # Add each list's items in a single call
+        self.active_list.addItems(active_names)
+        self.ignored_list.addItems(ignored_names)
+        
+        self._schedule_icon_hydration()
+    
+    def showEvent(self, event):
+        """Load thumbnails for the first visible rows once lists have their real size."""
+        super().showEvent(event)
+        self._schedule_icon_hydration()
+    
+    def _schedule_icon_hydration(self, *_):
+        """Request a thumbnail pass for the visible rows (coalesced)."""
+        self._hydrate_timer.start()
+    
+    def _hydrate_visible_icons(self):
+        """Set thumbnails on rows currently visible in either list."""
+        for block_list, bases in ((self.active_list, self._active_bases),
+                                  (self.ignored_list, self._ignored_bases)):
+            first = block_list.indexAt(QPoint(0, 0)).row()
+            if first < 0:
+                continue
+            last = block_list.indexAt(QPoint(0, block_list.viewport().height() - 1)).row()
+            if last < 0:
+                last = len(bases) - 1
             
-            # Add thumbnail
-            if display_block.texture_path.exists():
-                try:
-                    pixmap = QPixmap(str(display_block.texture_path))
-                    if not pixmap.isNull():
-                        scaled = pixmap.scaled(24, 24, Qt.AspectRatioMode.KeepAspectRatio, 
-                                             Qt.TransformationMode.FastTransformation)
-                        item.setIcon(scaled)
-                except Exception:
-                    pass
+            # Decode the newly visible rows' textures in parallel first
+            prefetch_thumbnails(
+                (self._base_textures[base_name] for base_name in bases[first:last + 1]
+                 if base_name not in self._hydrated_bases),
+                24
+            )
             
-            # Add to appropriate list
-            if is_ignored:
-                self.ignored_list.addItem(item)
-            else:
-                self.active_list.addItem(item)
+            for row in range(first, last + 1):
+                base_name = bases[row]
+                if base_name in self._hydrated_bases:
+                    continue
+                self._hydrated_bases.add(base_name)
+                thumbnail = self._get_thumbnail(self._base_textures[base_name])
+                if thumbnail is not None:
+                    block_list.item(row).setIcon(thumbnail)
+    
+    def _get_thumbnail(self, texture_path: Path) -> Optional[QPixmap]:
+        """Returns a cached 24x24 thumbnail, sized to match the lists' icon size."""
+        return get_thumbnail(texture_path, 24)
+    
+    def _schedule_filter(self):
+        """Restart the debounce timer on each search text change."""
+        self._filter_timer.start()
+    
+    def _match_search(self, search_text: str) -> Set[str]:
+        """Return base names containing search_text (lowercase)."""
+        if not self.block_manager:
+            return set()
+        # Suffix index is built once per load on the block manager
+        keys, owners = self.block_manager.get_base_name_index()
+        lo = bisect_left(keys, search_text)
+        hi = bisect_left(keys, search_text + '\uffff', lo)
+        return set(owners[lo:hi])
     
     def _filter_blocks(self):
         """Filter blocks based on search text."""
         search_text = self.search_input.text().lower()
+        # Typing and then deleting a character leaves nothing to redo
+        if search_text == self._applied_search:
+            return
+        self._applied_search = search_text
+        matches = self._match_search(search_text) if search_text else None
+        
+        # Rows persist across searches; only their visibility is toggled, with
+        # repaints held until the whole pass is done
+        with _updates_suspended(self.active_list, self.ignored_list):
+            for block_list, bases in ((self.active_list, self._active_bases),
+                                      (self.ignored_list, self._ignored_bases)):
+                for row, base_name in enumerate(bases):
+                    item = block_list.item(row)
+                    hidden = matches is not None and base_name not in matches
+                    # Only touch rows whose visibility actually changes
+                    if item.isHidden() != hidden:
+                        item.setHidden(hidden)
+        
+        self._schedule_icon_hydration()
+    
+    def _move_selected(self, source: QListWidget, source_bases: List[str],
+                       target: QListWidget, target_bases: List[str]):
+        """Move the selected rows from source to target, keeping their order."""
+        rows = sorted((index.row() for index in source.selectionModel().selectedRows()), reverse=True)
+        if not rows:
+            return
         
-        # Filter active list
-        for i in range(self.active_list.count()):
-            item = self.active_list.item(i)
-            base_name = item.data(Qt.ItemDataRole.UserRole)
-            item.setHidden(search_text not in base_name.lower())
-        
-        # Filter ignored list
-        for i in range(self.ignored_list.count()):
-            item = self.ignored_list.item(i)
-            base_name = item.data(Qt.ItemDataRole.UserRole)
-            item.setHidden(search_text not in base_name.lower())
+        with _updates_suspended(source, target):
+            # Descending rows stay valid while taking items
+            moved = [(source.takeItem(row), source_bases.pop(row)) for row in rows]
+            for item, base_name in reversed(moved):
+                target.addItem(item)
+                target_bases.append(base_name)
     
     def _move_to_ignored(self):
         """Move selected blocks from active to ignored."""
-        selected_items = self.active_list.selectedItems()
-        for item in selected_items:
-            base_name = item.data(Qt.ItemDataRole.UserRole)
-            # Remove from active list
-            row = self.active_list.row(item)
-            self.active_list.takeItem(row)
-            # Add to ignored list
-            self.ignored_list.addItem(item)
-        
+        self._move_selected(self.active_list, self._active_bases,
+                            self.ignored_list, self._ignored_bases)
         self._update_statistics()
     
     def _move_to_active(self):
         """Move selected blocks from ignored to active."""
-        selected_items = self.ignored_list.selectedItems()
-        for item in selected_items:
-            base_name = item.data(Qt.ItemDataRole.UserRole)
-            # Remove from ignored list
-            row = self.ignored_list.row(item)
-            self.ignored_list.takeItem(row)
-            # Add to active list
-            self.active_list.addItem(item)
-        
+        self._move_selected(self.ignored_list, self._ignored_bases,
+                            self.active_list, self._active_bases)
         self._update_statistics()
     
+    def _move_all(self, source: QListWidget, source_bases: List[str],
+                  target: QListWidget, target_bases: List[str]):
+        """Move every item from source to target in a single batch."""
+        with _updates_suspended(source, target):
+            # Take from the end so no remaining rows have to shift
+            items = [source.takeItem(row) for row in range(source.count() - 1, -1, -1)]
+            for item in reversed(items):
+                target.addItem(item)
+        target_bases.extend(source_bases)
+        source_bases.clear()
+    
     def _activate_all(self):
         """Move all blocks to active."""
-        while self.ignored_list.count() > 0:
-            item = self.ignored_list.takeItem(0)
-            self.active_list.addItem(item)
-        
+        self._move_all(self.ignored_list, self._ignored_bases,
+                       self.active_list, self._active_bases)
         self._update_statistics()
     
     def _ignore_all(self):
         """Move all blocks to ignored."""
-        while self.active_list.count() > 0:
-            item = self.active_list.takeItem(0)
-            self.ignored_list.addItem(item)
-        
+        self._move_all(self.active_list, self._active_bases,
+                       self.ignored_list, self._ignored_bases)
         self._update_statistics()
     
     def _reset_to_default(self):
@@ -273,18 +374,14 @@ class SettingsDialog(QDialog):
         )
         
         if reply == QMessageBox.StandardButton.Yes:
-            # Reset to default
-            default_ignored = self.block_manager.default_ignored_blocks.copy()
-            
-            # Add transparent blocks
-            from app.core.block_manager import BlockManager
-            for block in self.block_manager.all_blocks:
-                if block.has_transparency:
-                    base_name = BlockManager.get_base_block_name(block.block_id)
-                    default_ignored.add(base_name)
+            # Reset to default list plus transparent blocks
+            default_ignored = (
+                self.block_manager.default_ignored_blocks
+                | self.block_manager.transparent_base_names
+            )
             
             # Update block manager
-            self.block_manager.user_ignored_blocks = default_ignored
+            self.block_manager.user_ignored_blocks = frozenset(default_ignored)
             
             # Repopulate lists
             self._populate_lists()
@@ -293,27 +390,23 @@ class SettingsDialog(QDialog):
     def _save_and_apply(self):
         """Save settings and apply changes."""
         # Collect ignored blocks from ignored list
-        new_ignored = set()
+        new_ignored = set(self._ignored_bases)
         
-        for i in range(self.ignored_list.count()):
-            item = self.ignored_list.item(i)
-            base_name = item.data(Qt.ItemDataRole.UserRole)
-            new_ignored.add(base_name)
+        # Nothing changed since the dialog opened - keep the current matcher
+        if new_ignored == self._initial_ignored:
+            if self.block_manager:
+                self.block_manager.user_ignored_blocks = frozenset(new_ignored)
+            self.accept()
+            return
         
         # Update block manager
         if self.block_manager:
             old_active_count = len(self.block_manager.active_blocks)
             
-            self.block_manager.user_ignored_blocks = new_ignored
-            self.block_manager._apply_filters()
+            self.block_manager.user_ignored_blocks = frozenset(new_ignored)
             
-            # Recreate matcher
-            if self.block_manager.active_blocks:
-                from app.minecraft.texturepack.matcher import BlockMatcher
-                self.block_manager.matcher = BlockMatcher(
-                    self.block_manager.active_blocks, 
-                    allow_transparency=False
-                )
+            # Refilter the loaded blocks and recreate the matcher if needed
+            self.block_manager.reload_with_filters()
             
             new_active_count = len(self.block_manager.active_blocks)
         
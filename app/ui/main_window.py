@@ -3,19 +3,22 @@ Main Window - PySide6 version of the Minepixel Editor.
 """
 
 from __future__ import annotations
-from typing import Optional, List
+import time
+from typing import Optional, List, Tuple
 from pathlib import Path
 
 from PySide6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
     QToolBar, QStatusBar, QPushButton, QLabel, QDockWidget,
-    QFileDialog, QMessageBox, QProgressBar, QScrollArea, QSlider, QGroupBox
+    QFileDialog, QMessageBox, QProgressBar, QScrollArea, QSlider, QGroupBox, QMenu
 )
-from PySide6.QtCore import Qt, Signal, QSize
-from PySide6.QtGui import QAction, QIcon, QPixmap
+from PySide6.QtCore import Qt, Signal, Slot, QSize, QTimer, QEvent, QSignalBlocker
+from PySide6.QtGui import QAction, QIcon, QPixmap, QPixmapCache
 
+from app.core.events import REENTER_EVENT
 from app.ui.canvas_widget import CanvasWidget
 from app.ui.block_palette import BlockPalette
+from app.ui.thumbnails import THUMBNAIL_CACHE_LIMIT_KB, get_thumbnail
 from app.minecraft.texturepack.models import BlockTexture
 
 
@@ -24,18 +27,36 @@ class MainWindow(QMainWindow):
     
     # Signals
     load_image_requested = Signal(str)
-    export_requested = Signal()
+    export_requested = Signal(Path)
     export_block_list_requested = Signal(Path)
     settings_requested = Signal()
     brush_size_changed = Signal(int)
     
+    # Minimum seconds between progress bar value updates
+    PROGRESS_INTERVAL = 1 / 30
+    
     def __init__(self):
         super().__init__()
         
+        # Thumbnails of all widgets share one size-budgeted cache
+        QPixmapCache.setCacheLimit(THUMBNAIL_CACHE_LIMIT_KB)
+        
         # State
         self._current_blocks: List[BlockTexture] = []
         self._selected_block: Optional[BlockTexture] = None
         
+        # Hover status updates are coalesced to at most ~30 per second
+        self._pending_pos: Tuple[int, int] = (-1, -1)
+        self._status_timer = QTimer(self)
+        self._status_timer.setSingleShot(True)
+        self._status_timer.setInterval(33)
+        self._status_timer.timeout.connect(self._flush_status)
+        
+        # Last applied (value, maximum, text) of the progress bar
+        self._progress_state: Tuple[int, int, str] = (-1, -1, "")
+        self._progress_shown = False
+        self._progress_last_update = 0.0
+        
         # Setup UI
         self.setWindowTitle("Minepixel Editor - Minecraft Pixel Art Generator")
         self.setGeometry(100, 100, 1600, 900)
@@ -62,62 +83,30 @@ class MainWindow(QMainWindow):
         
         # File menu
         file_menu = menubar.addMenu("&File")
-        
-        load_action = QAction("&Load Image...", self)
-        load_action.setShortcut("Ctrl+O")
-        load_action.triggered.connect(self._on_load_image)
-        file_menu.addAction(load_action)
-        
-        file_menu.addSeparator()
-        
-        export_action = QAction("&Export Image...", self)
-        export_action.setShortcut("Ctrl+E")
-        export_action.triggered.connect(self._on_export_image)
-        file_menu.addAction(export_action)
-        
-        export_list_action = QAction("Export Block &List...", self)
-        export_list_action.setShortcut("Ctrl+L")
-        export_list_action.triggered.connect(self._on_export_block_list)
-        file_menu.addAction(export_list_action)
-        
-        file_menu.addSeparator()
-        
-        exit_action = QAction("E&xit", self)
-        exit_action.setShortcut("Ctrl+Q")
-        exit_action.triggered.connect(self.close)
-        file_menu.addAction(exit_action)
+        self._add_menu_actions(file_menu, [
+            ("&Load Image...", "Ctrl+O", self._on_load_image),
+            None,
+            ("&Export Image...", "Ctrl+E", self._on_export_image),
+            ("Export Block &List...", "Ctrl+L", self._on_export_block_list),
+            None,
+            ("E&xit", "Ctrl+Q", self.close),
+        ])
         
         # Edit menu
         edit_menu = menubar.addMenu("&Edit")
-        
-        settings_action = QAction("&Settings...", self)
-        settings_action.triggered.connect(self._on_settings)
-        edit_menu.addAction(settings_action)
+        self._add_menu_actions(edit_menu, [
+            ("&Settings...", None, self._on_settings),
+        ])
         
         # View menu
         view_menu = menubar.addMenu("&View")
-        
-        zoom_in_action = QAction("Zoom &In", self)
-        zoom_in_action.setShortcut("Ctrl++")
-        zoom_in_action.triggered.connect(self.canvas.zoom_in)
-        view_menu.addAction(zoom_in_action)
-        
-        zoom_out_action = QAction("Zoom &Out", self)
-        zoom_out_action.setShortcut("Ctrl+-")
-        zoom_out_action.triggered.connect(self.canvas.zoom_out)
-        view_menu.addAction(zoom_out_action)
-        
-        zoom_fit_action = QAction("&Fit to Window", self)
-        zoom_fit_action.setShortcut("Ctrl+0")
-        zoom_fit_action.triggered.connect(self.canvas.zoom_to_fit)
-        view_menu.addAction(zoom_fit_action)
-        
-        zoom_reset_action = QAction("&Reset View", self)
-        zoom_reset_action.setShortcut("Ctrl+R")
-        zoom_reset_action.triggered.connect(self.canvas.reset_view)
-        view_menu.addAction(zoom_reset_action)
-        
-        view_menu.addSeparator()
+        self._add_menu_actions(view_menu, [
+            ("Zoom &In", "Ctrl++", self.canvas.zoom_in),
+            ("Zoom &Out", "Ctrl+-", self.canvas.zoom_out),
+            ("&Fit to Window", "Ctrl+0", self.canvas.zoom_to_fit),
+            ("&Reset View", "Ctrl+R", self.canvas.reset_view),
+            None,
+        ])
         
         grid_action = QAction("Toggle &Grid", self)
         grid_action.setShortcut("Ctrl+G")
@@ -134,36 +123,17 @@ class MainWindow(QMainWindow):
         toolbar.setMovable(False)
         self.addToolBar(toolbar)
         
-        # Load Image
-        load_btn = QPushButton("Load Image")
-        load_btn.clicked.connect(self._on_load_image)
-        toolbar.addWidget(load_btn)
-        
-        # Export
-        export_btn = QPushButton("Export")
-        export_btn.clicked.connect(self._on_export_image)
-        toolbar.addWidget(export_btn)
-        
-        toolbar.addSeparator()
-        
-        # Zoom controls
-        zoom_in_btn = QPushButton("Zoom +")
-        zoom_in_btn.clicked.connect(self.canvas.zoom_in)
-        toolbar.addWidget(zoom_in_btn)
-        
-        zoom_out_btn = QPushButton("Zoom -")
-        zoom_out_btn.clicked.connect(self.canvas.zoom_out)
-        toolbar.addWidget(zoom_out_btn)
-        
-        zoom_fit_btn = QPushButton("Fit")
-        zoom_fit_btn.clicked.connect(self.canvas.zoom_to_fit)
-        toolbar.addWidget(zoom_fit_btn)
-        
-        zoom_reset_btn = QPushButton("Reset")
-        zoom_reset_btn.clicked.connect(self.canvas.reset_view)
-        toolbar.addWidget(zoom_reset_btn)
-        
-        toolbar.addSeparator()
+        self._add_tool_buttons(toolbar, [
+            ("Load Image", self._on_load_image),
+            ("Export", self._on_export_image),
+            None,
+            # Zoom controls
+            ("Zoom +", self.canvas.zoom_in),
+            ("Zoom -", self.canvas.zoom_out),
+            ("Fit", self.canvas.zoom_to_fit),
+            ("Reset", self.canvas.reset_view),
+            None,
+        ])
         
         # Grid toggle
         grid_btn = QPushButton("Toggle Grid")
@@ -176,9 +146,39 @@ class MainWindow(QMainWindow):
         toolbar.addSeparator()
         
         # Settings
-        settings_btn = QPushButton("Settings")
-        settings_btn.clicked.connect(self._on_settings)
-        toolbar.addWidget(settings_btn)
+        toolbar.addWidget(self._mk_tool_button("Settings", self._on_settings))
+    
+    def _add_menu_actions(self, menu: QMenu, table: list):
+        """Adds (text, shortcut, slot) entries to a menu; None adds a separator."""
+        actions = []
+        for entry in table:
+            if entry is None:
+                menu.addActions(actions)
+                menu.addSeparator()
+                actions = []
+                continue
+            
+            text, shortcut, slot = entry
+            action = QAction(text, self)
+            if shortcut:
+                action.setShortcut(shortcut)
+            action.triggered.connect(slot)
+            actions.append(action)
+        menu.addActions(actions)
+    
+    def _add_tool_buttons(self, toolbar: QToolBar, table: list):
+        """Adds (text, slot) buttons to a toolbar; None adds a separator."""
+        for entry in table:
+            if entry is None:
+                toolbar.addSeparator()
+            else:
+                toolbar.addWidget(self._mk_tool_button(*entry))
+    
+    def _mk_tool_button(self, text: str, slot) -> QPushButton:
+        """Creates a toolbar push button connected to slot."""
+        btn = QPushButton(text)
+        btn.clicked.connect(slot)
+        return btn
     
     def _create_dock_widgets(self):
         """Creates dock widgets."""
@@ -215,12 +215,14 @@ class MainWindow(QMainWindow):
         slider_layout.addWidget(QLabel("Size:"))
         
         from PySide6.QtWidgets import QSlider
+        # The slider moves over steps; step n is a (2n + 1)x(2n + 1) brush,
+        # so only odd sizes (1 to 15) are reachable
         self.brush_size_slider = QSlider(Qt.Orientation.Horizontal)
-        self.brush_size_slider.setMinimum(1)
-        self.brush_size_slider.setMaximum(15)
-        self.brush_size_slider.setValue(1)
+        self.brush_size_slider.setMinimum(0)
+        self.brush_size_slider.setMaximum(7)
+        self.brush_size_slider.setValue(0)
         self.brush_size_slider.setTickPosition(QSlider.TickPosition.TicksBelow)
-        self.brush_size_slider.setTickInterval(2)
+        self.brush_size_slider.setTickInterval(1)
         self.brush_size_slider.setMaximumWidth(120)  # Limit slider width
         self.brush_size_slider.valueChanged.connect(self._on_brush_size_changed)
         slider_layout.addWidget(self.brush_size_slider)
@@ -236,11 +238,14 @@ class MainWindow(QMainWindow):
         brush_size_layout.addWidget(quick_label)
         
         quick_buttons_layout = QHBoxLayout()
+        self._quick_size_btns = {}
         for size in [1, 3, 5, 7]:
             btn = QPushButton(f"{size}x{size}")
             btn.setMaximumWidth(45)
-            btn.clicked.connect(lambda checked, s=size: self._set_brush_size(s))
+            btn.setProperty("brush_size", size)
+            btn.clicked.connect(self._on_quick_size_clicked)
             quick_buttons_layout.addWidget(btn)
+            self._quick_size_btns[size] = btn
         
         brush_size_layout.addLayout(quick_buttons_layout)
         left_layout.addWidget(brush_size_group)
@@ -279,9 +284,25 @@ class MainWindow(QMainWindow):
         left_dock.setWidget(left_widget)
         self.addDockWidget(Qt.DockWidgetArea.LeftDockWidgetArea, left_dock)
         
-        # Right dock - Statistics
+        # Right dock - Statistics (contents are built after the window is shown)
         right_dock = QDockWidget("Block Statistics", self)
         right_dock.setAllowedAreas(Qt.DockWidgetArea.LeftDockWidgetArea | Qt.DockWidgetArea.RightDockWidgetArea)
+        self.addDockWidget(Qt.DockWidgetArea.RightDockWidgetArea, right_dock)
+        self.right_dock = right_dock
+        
+        # Set default width for right dock (statistics)
+        right_dock.setMinimumWidth(350)
+        self.resizeDocks([right_dock], [400], Qt.Orientation.Horizontal)
+        
+        self._stats_dock_built = False
+        QTimer.singleShot(0, self.ensure_stats_dock)
+    
+    @Slot()
+    def ensure_stats_dock(self):
+        """Builds the statistics dock contents on first use."""
+        if self._stats_dock_built:
+            return
+        self._stats_dock_built = True
         
         right_widget = QWidget()
         right_layout = QVBoxLayout(right_widget)
@@ -300,8 +321,11 @@ class MainWindow(QMainWindow):
         scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
         
         scroll_widget = QWidget()
+        self.stats_widget = scroll_widget
         self.stats_layout = QVBoxLayout(scroll_widget)
         self.stats_layout.setAlignment(Qt.AlignmentFlag.AlignTop)
+        # Statistics rows are inserted above this stretch
+        self.stats_layout.addStretch()
         scroll_widget.setLayout(self.stats_layout)
         scroll_area.setWidget(scroll_widget)
         right_layout.addWidget(scroll_area)
@@ -312,12 +336,7 @@ class MainWindow(QMainWindow):
         right_layout.addWidget(export_list_btn)
         
         right_widget.setLayout(right_layout)
-        right_dock.setWidget(right_widget)
-        self.addDockWidget(Qt.DockWidgetArea.RightDockWidgetArea, right_dock)
-        
-        # Set default width for right dock (statistics)
-        right_dock.setMinimumWidth(350)
-        self.resizeDocks([right_dock], [400], Qt.Orientation.Horizontal)
+        self.right_dock.setWidget(right_widget)
     
     def _create_status_bar(self):
         """Creates status bar."""
@@ -340,26 +359,54 @@ class MainWindow(QMainWindow):
     def _connect_signals(self):
         """Connects signals."""
         self.block_palette.block_selected.connect(self._on_palette_block_selected)
-        self.canvas.block_changed.connect(self._on_canvas_block_changed)
+        self.canvas.block_batch_changed.connect(self._on_canvas_blocks_changed)
         self.canvas.selection_changed.connect(self._on_canvas_selection_changed)
     
+    def event(self, event: QEvent) -> bool:
+        """Runs callables posted from worker threads as ReenterEvents."""
+        if event.type() == REENTER_EVENT:
+            event.fn()
+            return True
+        return super().event(event)
+    
     # Event handlers
+    @Slot()
     def _on_load_image(self):
         """Handles load image button."""
-        file_path, _ = QFileDialog.getOpenFileName(
-            self,
+        self._open_file_dialog(
             "Open Image",
-            "",
-            "Images (*.png *.jpg *.jpeg *.bmp *.gif)"
+            "Images (*.png *.jpg *.jpeg *.bmp *.gif)",
+            QFileDialog.AcceptMode.AcceptOpen,
+            self._on_image_file_selected
         )
-        
+    
+    @Slot(str)
+    def _on_image_file_selected(self, file_path: str):
+        """Handles the file chosen in the open image dialog."""
         if file_path:
             self.load_image_requested.emit(file_path)
     
+    @Slot()
     def _on_export_image(self):
         """Handles export image button."""
-        self.export_requested.emit()
+        if not self.canvas or not self.canvas._grid:
+            self.show_warning("Warning", "No image to export. Load an image first.")
+            return
+        
+        self._open_file_dialog(
+            "Export Image",
+            "PNG Images (*.png)",
+            QFileDialog.AcceptMode.AcceptSave,
+            self._on_export_image_file_selected
+        )
+    
+    @Slot(str)
+    def _on_export_image_file_selected(self, file_path: str):
+        """Handles the file chosen in the export image dialog."""
+        if file_path:
+            self.export_requested.emit(Path(file_path))
     
+    @Slot()
     def _on_export_block_list(self):
         """Handles export block list button."""
         # Check if we have a canvas with grid
@@ -367,41 +414,73 @@ class MainWindow(QMainWindow):
             self.show_warning("Export Error", "No grid loaded. Load an image first.")
             return
         
-        file_path, _ = QFileDialog.getSaveFileName(
-            self,
+        self._open_file_dialog(
             "Export Block List",
-            "",
-            "Text Files (*.txt)"
+            "Text Files (*.txt)",
+            QFileDialog.AcceptMode.AcceptSave,
+            self._on_block_list_file_selected
         )
-        
+    
+    @Slot(str)
+    def _on_block_list_file_selected(self, file_path: str):
+        """Handles the file chosen in the export block list dialog."""
         if file_path:
             # Request export from application
-            from pathlib import Path
             self.export_block_list_requested.emit(Path(file_path))
     
+    def _open_file_dialog(self, title: str, name_filter: str, accept_mode, on_selected):
+        """
+        Shows a window-modal file dialog without blocking in a nested event loop.
+        
+        The chosen path is delivered to on_selected through fileSelected.
+        """
+        dialog = QFileDialog(self, title, "", name_filter)
+        dialog.setAcceptMode(accept_mode)
+        if accept_mode == QFileDialog.AcceptMode.AcceptOpen:
+            dialog.setFileMode(QFileDialog.FileMode.ExistingFile)
+        dialog.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+        dialog.fileSelected.connect(on_selected)
+        dialog.open()
+    
+    @Slot()
     def _on_settings(self):
         """Handles settings button."""
         self.settings_requested.emit()
     
-    def _on_toggle_grid(self):
-        """Toggles grid visibility."""
-        show_grid = self.grid_action.isChecked()
-        self.canvas.set_show_grid(show_grid)
-        self.grid_btn.setChecked(show_grid)
+    @Slot(bool)
+    def _on_toggle_grid(self, checked: bool):
+        """Toggles grid visibility and keeps the menu action and toolbar button in sync."""
+        self.canvas.set_show_grid(checked)
+        for widget in (self.grid_action, self.grid_btn):
+            if widget.isChecked() != checked:
+                blocker = QSignalBlocker(widget)
+                widget.setChecked(checked)
+                blocker.unblock()
     
+    @Slot(object)
     def _on_palette_block_selected(self, block: BlockTexture):
         """Handles block selection from palette."""
         self._selected_block = block
         self.canvas.set_current_block(block)
         self._update_selected_block_display()
     
-    def _on_canvas_block_changed(self, x: int, y: int, block: BlockTexture):
-        """Handles block change on canvas."""
+    @Slot(list)
+    def _on_canvas_blocks_changed(self, changes: list):
+        """Handles a batch of block changes on canvas."""
         # Update statistics
         pass
     
+    @Slot(int, int)
     def _on_canvas_selection_changed(self, x: int, y: int):
         """Handles cursor position change on canvas."""
+        self._pending_pos = (x, y)
+        if not self._status_timer.isActive():
+            self._status_timer.start()
+    
+    @Slot()
+    def _flush_status(self):
+        """Shows the latest hovered position in the status bar."""
+        x, y = self._pending_pos
         block = self.canvas.get_block_at(x, y)
         if block:
             self.status_label.setText(f"Position: ({x}, {y}) | Block: {block.block_id}")
@@ -437,26 +516,52 @@ class MainWindow(QMainWindow):
         """Returns canvas widget."""
         return self.canvas
     
+    def get_thumbnail(self, path: Path, size: int = 48) -> Optional[QPixmap]:
+        """Returns a cached size x size thumbnail of a texture."""
+        return get_thumbnail(path, size)
+    
     def set_status(self, message: str):
         """Sets status bar message."""
         self.status_label.setText(message)
     
     def show_progress(self, value: int, maximum: int, text: str = ""):
         """Shows progress bar with value and optional text."""
-        if not self.progress_bar.isVisible():
+        value = int(value)
+        last_value, last_maximum, last_text = self._progress_state
+        if not text:
+            text = last_text
+        if (value, maximum, text) == self._progress_state:
+            return
+        
+        # Throttle plain value updates to ~30 Hz; text changes and completion always go through
+        now = time.monotonic()
+        if (self._progress_shown and text == last_text and maximum == last_maximum
+                and value < maximum and now - self._progress_last_update < self.PROGRESS_INTERVAL):
+            return
+        self._progress_last_update = now
+        
+        if not self._progress_shown:
+            self._progress_shown = True
             self.progress_bar.setVisible(True)
             self.progress_label.setVisible(True)
-        self.progress_bar.setMaximum(maximum)
-        self.progress_bar.setValue(int(value))
-        if text:
+        if maximum != last_maximum:
+            self.progress_bar.setMaximum(maximum)
+        if value != last_value:
+            self.progress_bar.setValue(value)
+        if text != last_text:
             self.progress_label.setText(text)
+        self._progress_state = (value, maximum, text)
     
     def hide_progress(self):
         """Hides progress bar."""
+        if not self._progress_shown:
+            return
+        
+        self._progress_shown = False
+        self._progress_state = (-1, -1, "")
         self.progress_bar.setVisible(False)
         self.progress_label.setVisible(False)
         self.progress_label.setText("")
-        self.progress_bar.setVisible(False)
     
     def _update_selected_block_display(self):
         """Updates selected block display."""
@@ -470,20 +575,10 @@ class MainWindow(QMainWindow):
                 f"Transparent: {'Yes' if self._selected_block.has_transparency else 'No'}"
             )
             
-            # Update texture thumbnail
-            if self._selected_block.texture_path.exists():
-                try:
-                    from PySide6.QtGui import QPixmap
-                    pixmap = QPixmap(str(self._selected_block.texture_path))
-                    if not pixmap.isNull():
-                        scaled = pixmap.scaled(
-                            48, 48,
-                            Qt.AspectRatioMode.KeepAspectRatio,
-                            Qt.TransformationMode.FastTransformation
-                        )
-                        self.selected_texture_label.setPixmap(scaled)
-                except Exception:
-                    self.selected_texture_label.clear()
+            # Update texture thumbnail (decoded and scaled once per texture)
+            scaled = self.get_thumbnail(self._selected_block.texture_path, 48)
+            if scaled is not None:
+                self.selected_texture_label.setPixmap(scaled)
             else:
                 self.selected_texture_label.clear()
         else:
@@ -510,21 +605,17 @@ class MainWindow(QMainWindow):
         )
         return reply == QMessageBox.StandardButton.Yes
     
-    def _on_toggle_grid(self, checked: bool):
-        """Toggles grid visibility."""
-        self.canvas.set_show_grid(checked)
-        self.canvas.update()
-    
+    @Slot(int)
     def _on_brush_size_changed(self, value: int):
         """Handles brush size slider change."""
-        # Ensure odd number for symmetry
-        if value % 2 == 0:
-            value += 1
-            self.brush_size_slider.setValue(value)
-        
-        self.brush_size_label.setText(f"{value}x{value}")
-        self.brush_size_changed.emit(value)
+        # Slider steps map to odd sizes, so no parity correction round-trip is needed
+        size = value * 2 + 1
+        self.brush_size_label.setText(f"{size}x{size}")
+        self.brush_size_changed.emit(size)
     
-    def _set_brush_size(self, size: int):
-        """Sets brush size from button."""
-        self.brush_size_slider.setValue(size)
+    @Slot()
+    def _on_quick_size_clicked(self):
+        """Sets brush size from the clicked quick size button."""
+        size = self.sender().property("brush_size")
+        if size is not None:
+            self.brush_size_slider.setValue(int(size) // 2)
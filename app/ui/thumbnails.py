@@ -0,0 +1,121 @@
+"""
+Thumbnails - shared cache of scaled block textures.
+Palette, settings, statistics and the selected-block preview all go through
+the process-wide QPixmapCache, so each texture is decoded once per size.
+"""
+
+from __future__ import annotations
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List, Optional, Set
+from pathlib import Path
+
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QPixmap, QPixmapCache, QImage
+
+
+# Enum members looked up once; PySide6 enum attribute access is slow in hot loops
+# (FAST_TRANSFORM is shared with the canvas)
+_IGNORE_ASPECT = Qt.AspectRatioMode.IgnoreAspectRatio
+FAST_TRANSFORM = Qt.TransformationMode.FastTransformation
+_PIXMAP_FORMAT = QImage.Format.Format_ARGB32_Premultiplied
+
+# Budget for QPixmapCache in kilobytes (set by MainWindow on startup)
+THUMBNAIL_CACHE_LIMIT_KB = 65536
+
+# Cache keys of textures that failed to load, so they are not retried
+_missing: Set[str] = set()
+
+# Decoder threads shared by every prefetch (created on first use)
+_decoder_pool: Optional[ThreadPoolExecutor] = None
+
+
+def get_thumbnail(texture_path: Path, size: int) -> Optional[QPixmap]:
+    """
+    Returns a size x size thumbnail of a texture, or None if it can't be loaded.
+
+    Args:
+        texture_path: Path to the texture PNG
+        size: Edge length of the thumbnail in pixels
+    """
+    key = f"{texture_path}@{size}"
+    if key in _missing:
+        return None
+
+    pixmap = QPixmap()
+    if QPixmapCache.find(key, pixmap):
+        return pixmap
+
+    return _store(key, _decode_scaled(texture_path, size))
+
+
+def prefetch_thumbnails(texture_paths: Iterable[Path], size: int) -> None:
+    """
+    Decodes every thumbnail that is not cached yet, overlapping the decodes
+    on the shared decoder pool (one worker per CPU).
+
+    QImage decoding is safe off the GUI thread; only the QPixmap conversion
+    and cache insert happen on the calling thread, as each result arrives.
+    """
+    pending = {}
+    pixmap = QPixmap()
+    for texture_path in texture_paths:
+        key = f"{texture_path}@{size}"
+        if key not in pending and key not in _missing and not QPixmapCache.find(key, pixmap):
+            pending[key] = texture_path
+
+    if len(pending) < 2:
+        return
+
+    images = _get_decoder_pool().map(lambda path: _decode_scaled(path, size), pending.values())
+    for key, image in zip(pending, images):
+        _store(key, image)
+
+
+def decode_images(texture_paths: Iterable[Path]) -> List[QImage]:
+    """
+    Decodes textures at full size on the shared decoder pool.
+
+    Results are in input order; a file that can't be loaded gives a null
+    QImage. Converting them to pixmaps is left to the (GUI thread) caller.
+    """
+    return list(_get_decoder_pool().map(lambda path: QImage(str(path)), texture_paths))
+
+
+def _get_decoder_pool() -> ThreadPoolExecutor:
+    """
+    Returns the thread pool for thumbnail decoding.
+
+    Settings rows hydrate on every scroll step; keeping the workers alive
+    avoids starting and joining a fresh set of threads for each small batch.
+    """
+    global _decoder_pool
+    if _decoder_pool is None:
+        _decoder_pool = ThreadPoolExecutor(max_workers=os.cpu_count() or 1,
+                                           thread_name_prefix="thumbnail")
+    return _decoder_pool
+
+
+def _decode_scaled(texture_path: Path, size: int) -> Optional[QImage]:
+    """Decodes and scales a texture; returns None if it can't be loaded."""
+    # A missing or broken file decodes to a null image instead of raising,
+    # so neither an exists() stat nor an exception guard is needed
+    image = QImage(str(texture_path))
+    if image.isNull():
+        return None
+    # Scale, then convert to the pixmap's native format here, so on the
+    # prefetch path that conversion also runs on the worker threads and
+    # QPixmap.fromImage on the GUI thread is a plain copy
+    image = image.scaled(size, size, _IGNORE_ASPECT, FAST_TRANSFORM)
+    return image.convertToFormat(_PIXMAP_FORMAT)
+
+
+def _store(key: str, image: Optional[QImage]) -> Optional[QPixmap]:
+    """Caches a decoded thumbnail as a pixmap (GUI thread only)."""
+    if image is None:
+        _missing.add(key)
+        return None
+
+    pixmap = QPixmap.fromImage(image)
+    QPixmapCache.insert(key, pixmap)
+    return pixmap
@@ -2,6 +2,8 @@
 Arquivo de configuração centralizado para o Minepixel Editor.
 """
 
+import os
+from functools import lru_cache
 from pathlib import Path
 
 # ==================== CAMINHOS ====================
@@ -76,14 +78,35 @@ ENABLE_TEXTURE_CACHE = True
 
 # ==================== FUNÇÕES AUXILIARES ====================
 
+# Indica se ensure_directories já criou as pastas nesta execução
+_DIRS_READY = False
+
+
 def ensure_directories():
-    """Cria os diretórios necessários se não existirem."""
+    """Cria os diretórios necessários se não existirem (apenas na primeira chamada)."""
+    global _DIRS_READY
+    if _DIRS_READY:
+        return
+    
     ASSETS_DIR.mkdir(exist_ok=True)
     MINECRAFT_TEXTURES_DIR.mkdir(exist_ok=True)
     BLOCKS_TEXTURE_DIR.mkdir(exist_ok=True)
     ICONS_DIR.mkdir(exist_ok=True)
     DATA_DIR.mkdir(exist_ok=True)
     OUTPUT_DIR.mkdir(exist_ok=True)
+    _DIRS_READY = True
+
+
+@lru_cache(maxsize=8)
+def _contar_pngs(pasta: Path, mtime_ns: int) -> int:
+    """
+    Conta os arquivos PNG de uma pasta sem montar uma lista.
+    
+    O mtime_ns faz parte da chave do cache: a pasta só é lida de novo
+    quando seu conteúdo muda.
+    """
+    with os.scandir(pasta) as entradas:
+        return sum(1 for entrada in entradas if entrada.name.endswith(".png"))
 
 
 def validate_texture_pack():
@@ -96,12 +119,12 @@ def validate_texture_pack():
     if not BLOCKS_TEXTURE_DIR.exists():
         return False, f"Pasta de texturas não encontrada: {BLOCKS_TEXTURE_DIR}"
     
-    png_files = list(BLOCKS_TEXTURE_DIR.glob("*.png"))
+    total_png = _contar_pngs(BLOCKS_TEXTURE_DIR, BLOCKS_TEXTURE_DIR.stat().st_mtime_ns)
     
-    if len(png_files) == 0:
+    if total_png == 0:
         return False, f"Nenhuma textura PNG encontrada em: {BLOCKS_TEXTURE_DIR}"
     
-    return True, f"✓ {len(png_files)} texturas encontradas"
+    return True, f"✓ {total_png} texturas encontradas"
 
 
 if __name__ == "__main__":
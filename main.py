@@ -4,12 +4,9 @@ GPU-accelerated Qt interface for Minecraft pixel art creation.
 """
 
 import sys
-from pathlib import Path
-
-# Add project root to path
-project_root = Path(__file__).parent
-sys.path.insert(0, str(project_root))
 
+# Running "python main.py" already puts this directory first on sys.path,
+# so the app package resolves without extra path entries
 from PySide6.QtWidgets import QApplication
 from PySide6.QtCore import Qt
 
@@ -18,11 +15,13 @@ from app.application import MinepixelEditorApp
 
 def main():
     """Main entry point."""
-    print("="*70)
-    print("Minepixel Editor - PySide6 Version")
-    print("="*70)
-    print()
-    print("[INFO] Initializing Qt application...")
+    sys.stdout.write(
+        f"{'=' * 70}\n"
+        "Minepixel Editor - PySide6 Version\n"
+        f"{'=' * 70}\n"
+        "\n"
+        "[INFO] Initializing Qt application...\n"
+    )
     
     # Create Qt application
     app = QApplication(sys.argv)
@@ -35,17 +34,21 @@ def main():
     editor = MinepixelEditorApp()
     editor.setup()
     
-    print("[INFO] Application ready!")
-    print()
-    print("Controls:")
-    print("   • Load Image: File menu or Toolbar")
-    print("   • Pan: Middle mouse button")
-    print("   • Zoom: Mouse scroll wheel")
-    print("   • Paint: Left mouse button")
-    print("   • Pick Block: Select Picker tool")
-    print()
-    print("[INFO] Entering main loop...")
-    print()
+    # Build the banner once and emit it with a single write
+    sys.stdout.write("".join(f"{line}\n" for line in (
+        "[INFO] Application ready!",
+        "",
+        "Controls:",
+        "   • Load Image: File menu or Toolbar",
+        "   • Pan: Middle mouse button",
+        "   • Zoom: Mouse scroll wheel",
+        "   • Paint: Left mouse button",
+        "   • Pick Block: Select Picker tool",
+        "",
+        "[INFO] Entering main loop...",
+        "",
+    )))
+    sys.stdout.flush()
     
     # Run application
     sys.exit(editor.run())
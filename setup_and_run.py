@@ -6,6 +6,8 @@ Works on Windows, Linux, and macOS
 
 import os
 import sys
+import shutil
+import hashlib
 import subprocess
 import platform
 from pathlib import Path
@@ -61,23 +63,98 @@ def create_venv():
     return python_exe, venv_dir
 
 
-def install_dependencies(python_exe):
-    """Install project dependencies."""
-    print("[INFO] Atualizando pip...")
+def cpu_supports_pillow_simd():
+    """Check for an x86_64 Linux CPU with SSE4.2 (needed by pillow-simd)."""
+    if platform.system() != "Linux" or platform.machine() != "x86_64":
+        return False
     try:
+        return "sse4_2" in Path("/proc/cpuinfo").read_text()
+    except OSError:
+        return False
+
+
+def pillow_simd_requested():
+    """Whether this run should use pillow-simd (opt-in via MINEPIXEL_PILLOW_SIMD=1)."""
+    return os.environ.get("MINEPIXEL_PILLOW_SIMD") == "1" and cpu_supports_pillow_simd()
+
+
+def remove_pillow_simd(python_exe):
+    """Uninstall a pillow-simd left by an earlier opt-in run, before Pillow is reinstalled."""
+    pip = [str(python_exe), "-m", "pip"]
+    installed = subprocess.run(
+        pip + ["show", "pillow-simd"],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    ).returncode == 0
+    if not installed:
+        return
+    
+    # Both distributions own PIL/; remove both so requirements installs a clean Pillow
+    print("[INFO] Removendo pillow-simd...")
+    subprocess.run(
+        pip + ["uninstall", "-y", "pillow-simd", "pillow"],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+
+
+def install_pillow_simd(python_exe):
+    """Replace Pillow with the SIMD build."""
+    pip = [str(python_exe), "-m", "pip"]
+    
+    print("[INFO] Instalando pillow-simd...")
+    try:
+        # Pillow must go first: both distributions own PIL/, and installing
+        # one over the other breaks a later upgrade or uninstall of either
+        subprocess.run(
+            pip + ["uninstall", "-y", "pillow"],
+            check=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
+        )
         subprocess.run(
-            [str(python_exe), "-m", "pip", "install", "--upgrade", "pip"],
+            pip + ["install", "pillow-simd"],
             check=True,
             stdout=subprocess.DEVNULL,
             stderr=subprocess.DEVNULL
         )
+        print("[OK] pillow-simd instalado!")
     except subprocess.CalledProcessError:
-        print("[WARNING] Falha ao atualizar pip, continuando...")
+        print("[WARNING] Falha ao instalar pillow-simd (requer compilador), usando Pillow padrão.")
+        # Put back the Pillow from requirements.txt
+        subprocess.run(
+            pip + ["install", "-r", "requirements.txt"],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
+        )
+
+
+def install_dependencies(python_exe, venv_dir):
+    """Install project dependencies (skipped when requirements.txt is unchanged)."""
+    use_simd = pillow_simd_requested()
+    
+    # Sentinel tied to the requirements contents and the pillow-simd choice:
+    # warm runs skip pip entirely, and toggling MINEPIXEL_PILLOW_SIMD reinstalls
+    key = Path("requirements.txt").read_bytes() + (b"\npillow-simd" if use_simd else b"")
+    req_hash = hashlib.sha1(key).hexdigest()[:12]
+    sentinel = venv_dir / f".deps_ok_{req_hash}"
+    if sentinel.exists():
+        print("[INFO] Dependências já instaladas.")
+        return
+    
+    if not use_simd:
+        remove_pillow_simd(python_exe)
     
     print("[INFO] Instalando dependências...")
+    # uv resolves and installs much faster than pip when it is available;
+    # otherwise pip upgrades itself in the same process that installs
+    if shutil.which("uv"):
+        command = ["uv", "pip", "install", "--python", str(python_exe), "-r", "requirements.txt"]
+    else:
+        command = [str(python_exe), "-m", "pip", "install", "--upgrade", "pip", "-r", "requirements.txt"]
     try:
         subprocess.run(
-            [str(python_exe), "-m", "pip", "install", "-r", "requirements.txt"],
+            command,
             check=True,
             stdout=subprocess.DEVNULL,
             stderr=subprocess.DEVNULL
@@ -86,6 +163,14 @@ def install_dependencies(python_exe):
     except subprocess.CalledProcessError:
         print("[ERROR] Falha ao instalar dependências.")
         sys.exit(1)
+    
+    if use_simd:
+        install_pillow_simd(python_exe)
+    
+    # Drop sentinels from older requirements before recording this one
+    for old_sentinel in venv_dir.glob(".deps_ok_*"):
+        old_sentinel.unlink()
+    sentinel.touch()
 
 
 def run_application(python_exe):
@@ -119,7 +204,7 @@ def main():
     print()
     
     # Install dependencies
-    install_dependencies(python_exe)
+    install_dependencies(python_exe, venv_dir)
     print()
     
     # Run application